@@ -0,0 +1,246 @@
+"""
+Ingest/render benchmark for MQTT Monitoring App
+Feeds synthetic messages through MqttClient.on_message into the real
+ingest worker, visualization and graphs on an offscreen Qt platform, and
+writes the results as JSON so runs of different versions can be compared.
+
+    python src/benchmark.py --rate 2000 --topics 4 --keys 8 --graphs 4 --output bench.json
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+from PyQt5 import QtWidgets, QtCore
+from config import APP_VERSION
+from visualization import Visualization
+from mqtt_client import MqttClient
+from ingest_worker import IngestWorker
+from replay import ReplayMessage
+from latency_stats import pipeline_latency, LatencyHistogram
+
+PROBE_INTERVAL_MS = 10  # event-loop latency probe
+
+
+def rss_bytes():
+    """Resident memory of this process, or None where it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class SyntheticPublisher:
+    """Deliver messages to on_message at a fixed rate (0 = as fast as possible) from its own thread"""
+
+    def __init__(self, on_message, rate, topics, keys, variants=256):
+        self.on_message = on_message
+        self.rate = rate
+        self.sent = 0
+        self.running = False
+        self.thread = None
+        # Payloads are built up front so the publisher costs little next to the app
+        key_names = [f"k{k}" for k in range(keys)]
+        self.messages = []
+        for i in range(variants):
+            for t in range(topics):
+                data = {key: round((i * 0.37 + k * 1.1 + t) % 100.0, 3) for k, key in enumerate(key_names)}
+                self.messages.append((f"bench/t{t}", json.dumps(data).encode()))
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="SyntheticPublisher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def run(self):
+        messages = self.messages
+        count = len(messages)
+        start = time.monotonic()
+        while self.running:
+            if self.rate > 0:
+                due = int((time.monotonic() - start) * self.rate) - self.sent
+                if due <= 0:
+                    time.sleep(0.001)
+                    continue
+            else:
+                due = 100
+            for _ in range(due):
+                topic, payload = messages[self.sent % count]
+                self.on_message(None, None, ReplayMessage(topic, payload))
+                self.sent += 1
+
+
+class Benchmark:
+    """One scenario: a Visualization with graphs, fed through MqttClient and the ingest worker"""
+
+    def __init__(self, args):
+        self.args = args
+        self.visualization = Visualization()
+        self.visualization.resize(1400, 900)
+        self.visualization.show()
+
+        self.ingest_worker = IngestWorker()
+        self.ingest_worker.start()
+        # Never connected: messages enter through on_message exactly as paho would deliver them
+        self.mqtt_client = MqttClient("127.0.0.1", 1883, ingest_worker=self.ingest_worker)
+        self.visualization.scheduler.add_frame_hook(self.drain_ingest)
+
+        self.setup_graphs()
+
+        self.measuring = False
+        self.frame_times = LatencyHistogram()
+        self.graph_times = LatencyHistogram()
+        self.loop_latency = LatencyHistogram()
+        self.visualization.scheduler.frame_rendered.connect(self.on_frame_rendered)
+
+        self.probe = QtCore.QTimer()
+        self.probe.setTimerType(QtCore.Qt.PreciseTimer)
+        self.probe.timeout.connect(self.on_probe)
+        self.last_probe = None
+
+        self.publisher = SyntheticPublisher(self.mqtt_client.on_message, args.rate, args.topics, args.keys)
+
+    def setup_graphs(self):
+        """Add graphs; each plots vars_per_graph keys, round robin over the keys"""
+        keys = [f"k{k}" for k in range(self.args.keys)]
+        registry = self.visualization.variable_registry
+        registry.register(keys)
+        scheduler = self.visualization.scheduler
+        while len(self.visualization.graphs) < self.args.graphs:
+            self.visualization.add_new_graph()
+        for g, graph in enumerate(self.visualization.graphs[:self.args.graphs]):
+            for v in range(self.args.vars_per_graph):
+                graph.variable_selector.setCurrentIndex((g * self.args.vars_per_graph + v) % len(keys))
+                graph.add_variable()
+            # Time every repaint of this graph through the scheduler's target hook
+            scheduler.remove_target(graph)
+            scheduler.add_target(graph, self.timed_render(graph.update_graph))
+            if self.args.record:
+                graph.start_recording()
+
+    def timed_render(self, render):
+        def timed():
+            start = time.perf_counter()
+            render()
+            if self.measuring:
+                self.graph_times.record(time.perf_counter() - start)
+        return timed
+
+    def drain_ingest(self):
+        """Same hand-off as MainApp.drain_ingest, feeding the visualization directly"""
+        self.ingest_worker.dispatch(self.handle_record)
+
+    def handle_record(self, record):
+        self.mqtt_client.detect_topics(record)
+        self.visualization.update(record)
+
+    def on_frame_rendered(self, stats):
+        if self.measuring:
+            self.frame_times.record(stats["last_frame_ms"] / 1000.0)
+
+    def on_probe(self):
+        now = time.perf_counter()
+        if self.last_probe is not None and self.measuring:
+            lateness = now - self.last_probe - PROBE_INTERVAL_MS / 1000.0
+            self.loop_latency.record(max(0.0, lateness))
+        self.last_probe = now
+
+    def begin_measuring(self):
+        """End of warm-up: reset every counter the results are computed from"""
+        pipeline_latency.reset()
+        self.ingest_worker.reset_max_depth()
+        self.measuring = True
+        self.start_time = time.monotonic()
+        self.start_stats = self.ingest_worker.get_stats()
+        self.start_sent = self.publisher.sent
+        self.start_rss = rss_bytes()
+
+    def run(self):
+        app = QtWidgets.QApplication.instance()
+        pipeline_latency.enabled = True
+        self.publisher.start()
+        self.probe.start(PROBE_INTERVAL_MS)
+        QtCore.QTimer.singleShot(int(self.args.warmup * 1000), self.begin_measuring)
+        QtCore.QTimer.singleShot(int((self.args.warmup + self.args.duration) * 1000), app.quit)
+        app.exec_()
+
+        elapsed = time.monotonic() - self.start_time
+        stats = self.ingest_worker.get_stats()
+        end_rss = rss_bytes()
+        self.publisher.stop()
+        self.probe.stop()
+        self.ingest_worker.stop()
+        return self.results(elapsed, stats, end_rss)
+
+    def results(self, elapsed, stats, end_rss):
+        delivered = stats["delivered"] - self.start_stats["delivered"]
+        sent = self.publisher.sent - self.start_sent
+        memory = {"start_bytes": self.start_rss, "end_bytes": end_rss}
+        if self.start_rss is not None and end_rss is not None:
+            memory["growth_bytes"] = end_rss - self.start_rss
+            memory["growth_bytes_per_s"] = (end_rss - self.start_rss) / elapsed
+        return {
+            "benchmark": "ingest_render",
+            "app_version": APP_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(self.args),
+            "results": {
+                "elapsed_s": elapsed,
+                "offered_msgs_per_s": sent / elapsed,
+                "sustained_msgs_per_s": delivered / elapsed,
+                "dropped": stats["dropped"] - self.start_stats["dropped"],
+                "max_queue_depth": stats["max_depth"],
+                "event_loop_latency": self.loop_latency.summary(),
+                "frame_time": self.frame_times.summary(),
+                "graph_render_time": self.graph_times.summary(),
+                "memory": memory,
+            },
+            "stages": pipeline_latency.snapshot(),
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless ingest/render benchmark")
+    parser.add_argument("--rate", type=float, default=1000, help="messages per second (0 = as fast as possible)")
+    parser.add_argument("--topics", type=int, default=4, help="number of topics")
+    parser.add_argument("--keys", type=int, default=8, help="numeric keys per message")
+    parser.add_argument("--graphs", type=int, default=2, help="number of graphs")
+    parser.add_argument("--vars-per-graph", type=int, default=2, help="variables plotted per graph")
+    parser.add_argument("--record", action="store_true", help="record on every graph")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds before measuring")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = QtWidgets.QApplication(sys.argv[:1])
+    result = Benchmark(args).run()
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 Configuration file for MQTT Monitoring App
 """
 
+import os
+
 # MQTT Configuration
 MQTT_BROKER = "192.168.5.1"
 MQTT_PORT = 1883
@@ -24,6 +26,40 @@ APP_STYLE = "Fusion"  # "Windows", "Fusion", "WindowsVista"
 # Graph Configuration
 MAX_DATA_POINTS = 100
 REFRESH_RATE_MS = 100  # Refresh rate in milliseconds
+GRAPH_X_HEADROOM_S = 2.0  # Minimum room ahead of the newest sample; the time axis (full redraw) moves at most this often
+GRAPH_MIN_VIEW_S = 0.001  # Narrowest time span a stopped recording can be zoomed to
+
+# Timestamps
+DEVICE_TIMESTAMP_FIELD = "device_ts"  # Optional payload field with the device's sample time; None to ignore
+DEVICE_TIMESTAMP_SCALE = 0.001  # Device timestamp units in seconds (0.001 for millis())
+DEVICE_CLOCK_RESYNC_S = 2.0  # Re-anchor a device clock that drifts or restarts by more than this
+
+# Payload Decoders
+# Checked in order; the first entry whose topic pattern (+, #) matches decodes the payload.
+# Unmatched topics are decoded as MessagePack when the payload is a MessagePack map, else as JSON/number/text.
+#   "struct":  fixed-layout frames; fields are (name, struct code) or (name, struct code, scale)
+#   "msgpack": MessagePack maps (e.g. ArduinoJson serializeMsgPack)
+#   "json":    JSON objects, bare numbers or plain text
+PAYLOAD_DECODERS = [
+    # {"topic": "robot/+/imu", "format": "struct", "byte_order": "<",
+    #  "fields": [("device_ts", "I"), ("ax", "h", 0.001), ("ay", "h", 0.001), ("az", "h", 0.001)]},
+    # {"topic": "robot/+/odom", "format": "msgpack"},
+]
+
+# Diagnostics
+LATENCY_STATS_ENABLED = False  # Per-stage latency histograms (can also be switched on from Tools > Diagnostics)
+
+# Recording Configuration
+RECORDING_CHUNK_SIZE = 4096  # Samples allocated at a time per recorded variable
+RECORDING_VALUE_DTYPE = "float32"  # "float32" or "float64" for recorded values
+RECORDING_BACKEND = "memory"  # "memory" or "disk" (append-only session files, survive crashes)
+RECORDING_DIR = os.path.join(os.path.expanduser("~"), ".mqtt_monitor", "recordings")
+RECORDING_FLUSH_INTERVAL_S = 1.0  # Max time samples stay in memory before reaching disk
+RECORDING_DISPLAY_INTERVAL_MS = 200  # Screen refresh while recording; every sample is still recorded
+
+# Ingest Configuration
+INGEST_QUEUE_SIZE = 20000  # Max messages waiting between the network and GUI threads
+INGEST_OVERLOAD_POLICY = "drop_oldest"  # "drop_oldest", "keep_latest", "block"
 
 # Map Configuration
 MAP_WIDTH = 15  # meters
@@ -0,0 +1,33 @@
+"""
+Saved connection settings for MQTT Monitoring App
+Read and written by the GUI and read by the headless recorder
+"""
+
+import json
+import os
+
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".mqtt_monitor")
+CONNECTIONS_FILE = os.path.join(CONFIG_DIR, "connections.json")
+
+
+def load_connection_settings():
+    """Return the saved connection settings, or None if there are none"""
+    try:
+        if not os.path.exists(CONNECTIONS_FILE):
+            return None
+        with open(CONNECTIONS_FILE, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading settings: {e}")
+        return None
+
+
+def save_connection_settings(settings):
+    """Save connection settings to file"""
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        with open(CONNECTIONS_FILE, "w") as f:
+            json.dump(settings, f, indent=2)
+        print(f"Settings saved to {CONNECTIONS_FILE}")
+    except Exception as e:
+        print(f"Error saving settings: {e}")
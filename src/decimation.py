@@ -0,0 +1,162 @@
+"""
+Level-of-detail decimation for MQTT Monitoring App
+Min/max reduction to the plot's pixel width and a multi-resolution pyramid
+per recorded series, so drawing cost does not grow with the recording
+"""
+
+import numpy as np
+from series_store import RecordingBuffer
+
+# Raw samples folded into one min/max pair per pyramid step (8x fewer points per level)
+PYRAMID_BLOCK = 16
+# Samples of a session file DATA chunk per min/max pair of its LOD chunk
+LOD_BLOCK = 64
+
+
+def block_minmax(times, values, block):
+    """Reduce every full block of samples to its min and max, kept in time order"""
+    n = len(times) // block
+    if not n:
+        return times[:0], values[:0]
+    shaped = values[:n * block].reshape(n, block)
+    base = np.arange(n) * block
+    imin = shaped.argmin(axis=1) + base
+    imax = shaped.argmax(axis=1) + base
+    index = np.empty(2 * n, dtype=np.int64)
+    index[0::2] = np.minimum(imin, imax)
+    index[1::2] = np.maximum(imin, imax)
+    return times[index], values[index]
+
+
+def blocks_minmax(times, values, block):
+    """block_minmax, with a last min/max pair for samples left over after the full blocks"""
+    n = len(times)
+    rest = n // block * block
+    head_t, head_v = block_minmax(times, values, block)
+    if rest == n:
+        return head_t, head_v
+    tail_t, tail_v = times[rest:], values[rest:]
+    lo = int(tail_v.argmin())
+    hi = int(tail_v.argmax())
+    index = [lo, hi] if lo <= hi else [hi, lo]
+    return np.concatenate((head_t, tail_t[index])), np.concatenate((head_v, tail_v[index]))
+
+
+def minmax_decimate(times, values, buckets):
+    """Keep the min and max of each of about buckets equal-count buckets
+
+    Peaks survive at any zoom level, unlike plain striding.
+    """
+    n = len(times)
+    if buckets <= 0 or n <= 2 * buckets:
+        return times, values
+    return blocks_minmax(times, values, n // buckets)
+
+
+class LodPyramid:
+    """Min/max levels over one record_data buffer, extended incrementally as it grows
+
+    Level k holds one min/max pair per PYRAMID_BLOCK points of level k - 1.
+    Points not yet folded into the next level stay as a short tail, so every
+    level plus the tails below it covers the whole series.
+    """
+
+    def __init__(self, source, block=PYRAMID_BLOCK):
+        self.source = source     # RecordingBuffer
+        self.block = block
+        self.levels = []         # (times, values) RecordingBuffer per level, finest first
+        self.consumed = []       # points of the level below already folded into each level
+
+    def update(self):
+        """Fold samples appended to the source since the last call into the pyramid"""
+        block = self.block
+        below = None
+        below_count = len(self.source)
+        level = 0
+        while True:
+            done = self.consumed[level] if level < len(self.levels) else 0
+            blocks = (below_count - done) // block
+            if not blocks:
+                return
+            if below is None:
+                src_t, src_v = self.source.tail(done)
+                src_t, src_v = src_t[:blocks * block], src_v[:blocks * block]
+            else:
+                src_t, src_v = below.view()
+                src_t, src_v = src_t[done:done + blocks * block], src_v[done:done + blocks * block]
+            if level == len(self.levels):
+                self.levels.append(RecordingBuffer(value_dtype=src_v.dtype))
+                self.consumed.append(0)
+            pair_t, pair_v = block_minmax(src_t, src_v, block)
+            self.levels[level].extend(pair_t, pair_v)
+            self.consumed[level] = done + blocks * block
+            below = self.levels[level]
+            below_count = len(below)
+            level += 1
+
+    def window(self, t_start, t_end, max_points):
+        """(times, values) covering [t_start, t_end] with at most about max_points points"""
+        counts = []
+        for level in self.levels:
+            times = level.view()[0]
+            counts.append(int(np.searchsorted(times, t_end, side="right") -
+                              np.searchsorted(times, t_start, side="left")))
+        # Level 0 has one pair per block of raw samples, which estimates the raw count
+        if not counts or counts[0] * self.block // 2 <= max_points:
+            return self.source.view_window(t_start, t_end)
+        chosen = next((k for k, count in enumerate(counts) if count <= max_points), len(counts) - 1)
+
+        parts = [self.levels[chosen].view_window(t_start, t_end)]
+        # Newest points, not folded into the chosen level yet
+        for k in range(chosen - 1, -1, -1):
+            times, values = self.levels[k].view()
+            start = self.consumed[k + 1]
+            parts.append((times[start:], values[start:]))
+        parts.append(self.source.tail(self.consumed[0]))
+
+        times = np.concatenate([part[0] for part in parts])
+        values = np.concatenate([part[1] for part in parts])
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        return times[lo:hi], values[lo:hi]
+
+    def time_range(self):
+        """(t_min, t_max) of the source, or None when it is empty"""
+        times = self.source.view()[0]
+        if not len(times):
+            return None
+        return float(times[0]), float(times[-1])
+
+
+class ChunkPyramid:
+    """The same interface over a DiskChannel, with every level read from its session file
+
+    Levels, finest first: the raw DATA chunks, the LOD chunks written beside them
+    and the per-chunk min/max of the session index. Only the index is in memory.
+    """
+
+    def __init__(self, source):
+        self.source = source     # DiskChannel
+
+    def update(self):
+        pass  # the session file is the pyramid; it grows with the recording
+
+    def window(self, t_start, t_end, max_points):
+        """(times, values) covering [t_start, t_end] from the coarsest level with max_points points or more"""
+        # Whole chunks overlapping the window: an estimate from the index, without reading samples
+        samples, chunks = self.source.window_size(t_start, t_end)
+        if 2 * chunks >= max_points:
+            return self.source.summary_window(t_start, t_end)
+        if 2 * samples // LOD_BLOCK >= max_points:
+            return self.source.lod_window(t_start, t_end)
+        return self.source.view_window(t_start, t_end)
+
+    def time_range(self):
+        return self.source.time_range()
+
+
+def pyramid_for(source):
+    """LodPyramid for an in-memory buffer, ChunkPyramid for a channel of a session file"""
+    if hasattr(source, "summary_window"):
+        return ChunkPyramid(source)
+    return LodPyramid(source)
@@ -0,0 +1,89 @@
+"""
+Diagnostics dialog for MQTT Monitoring App
+Shows the per-stage latency histograms and dumps them to a file
+"""
+
+from PyQt5 import QtWidgets, QtCore
+from latency_stats import pipeline_latency
+
+COLUMNS = ["Stage", "Count", "p50 (ms)", "p99 (ms)", "Max (ms)", "Mean (ms)"]
+SUMMARY_KEYS = ["count", "p50_ms", "p99_ms", "max_ms", "mean_ms"]
+
+
+class DiagnosticsDialog(QtWidgets.QDialog):
+    """Pipeline latency panel, refreshed once a second while visible"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pipeline Diagnostics")
+        self.setMinimumWidth(520)
+
+        layout = QtWidgets.QVBoxLayout()
+        self.setLayout(layout)
+
+        self.enabled_check = QtWidgets.QCheckBox("Collect latency statistics")
+        self.enabled_check.setChecked(pipeline_latency.enabled)
+        self.enabled_check.toggled.connect(self.set_enabled)
+        layout.addWidget(self.enabled_check)
+
+        self.table = QtWidgets.QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        self.reset_button = QtWidgets.QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        self.dump_button = QtWidgets.QPushButton("Dump...")
+        self.dump_button.clicked.connect(self.dump)
+        self.close_button = QtWidgets.QPushButton("Close")
+        self.close_button.clicked.connect(self.close)
+        button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.dump_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def set_enabled(self, enabled):
+        pipeline_latency.enabled = enabled
+
+    def reset(self):
+        pipeline_latency.reset()
+        self.refresh()
+
+    def refresh(self):
+        snapshot = pipeline_latency.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (stage, summary) in enumerate(snapshot.items()):
+            cells = [stage, str(summary["count"])] + [f"{summary[key]:.3f}" for key in SUMMARY_KEYS[1:]]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+
+    def dump(self):
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Dump Latency Statistics", "latency.json", "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            pipeline_latency.dump(file_path)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Dump Error", f"Error writing statistics: {str(e)}")
@@ -0,0 +1,71 @@
+"""
+Export dialog for MQTT Monitoring App
+Asks for a file and an alignment mode, then runs an ExportJob with a progress dialog
+"""
+
+from PyQt5 import QtWidgets, QtCore
+from exporter import ExportJob, AS_OF, UNION
+
+ALIGN_CHOICES = [("As-of (last known value)", AS_OF), ("Exact timestamps only", UNION)]
+
+
+class ExportProgressDialog(QtWidgets.QProgressDialog):
+    """Progress of one background export; cancelling stops the job and removes the partial file"""
+
+    progress_changed = QtCore.pyqtSignal(int)
+    export_finished = QtCore.pyqtSignal(str)  # error message, empty on success
+
+    def __init__(self, parent, series, path, mode):
+        super().__init__(f"Exporting to {path}...", "Cancel", 0, 1000, parent)
+        self.setWindowTitle("Export Data")
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.path = path
+
+        # The job reports from its own thread; signals bring the updates to the GUI thread
+        self.job = ExportJob(series, path, mode,
+                             on_progress=lambda fraction: self.progress_changed.emit(int(fraction * 1000)),
+                             on_finished=self.export_finished.emit)
+        self.progress_changed.connect(self.setValue)
+        self.export_finished.connect(self.on_finished)
+        self.canceled.connect(self.job.cancel)
+
+    def start(self):
+        self.setValue(0)
+        self.show()
+        self.job.start()
+
+    def on_finished(self, error):
+        # Closing a progress dialog emits canceled; the job is already done
+        self.canceled.disconnect(self.job.cancel)
+        self.close()
+        parent = self.parentWidget()
+        if error:
+            QtWidgets.QMessageBox.critical(parent, "Export Error", f"Error exporting data: {error}")
+        elif not self.job.cancelled:
+            QtWidgets.QMessageBox.information(
+                parent, "Export Successful", f"Exported {self.job.rows} rows to {self.path}")
+        self.deleteLater()
+
+
+def export_series(parent, series):
+    """Export [(name, load)] series (see ExportJob) to a file chosen by the user, in the background"""
+    file_path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+        parent, "Save Data", "", "CSV Files (*.csv);;NumPy Archive (*.npz);;All Files (*)"
+    )
+    if not file_path:
+        return None
+    if selected_filter.startswith("NumPy") and not file_path.lower().endswith(".npz"):
+        file_path += ".npz"
+
+    labels = [label for label, _ in ALIGN_CHOICES]
+    label, ok = QtWidgets.QInputDialog.getItem(
+        parent, "Align Series", "Timeline for series sampled at different times:", labels, 0, False)
+    if not ok:
+        return None
+    mode = dict(ALIGN_CHOICES)[label]
+
+    dialog = ExportProgressDialog(parent, series, file_path, mode)
+    dialog.start()
+    return dialog
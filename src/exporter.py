@@ -0,0 +1,142 @@
+"""
+Data export for MQTT Monitoring App
+Merges recorded series on one timeline with NumPy and writes CSV or NPZ on a worker thread
+"""
+
+import csv
+import os
+import threading
+import zipfile
+import numpy as np
+
+# Alignment modes
+AS_OF = "asof"    # every timestamp of any series; each column holds its last known value
+UNION = "union"   # every timestamp of any series; a column is empty where it has no sample
+ALIGN_MODES = (AS_OF, UNION)
+
+# Rows aligned and written per step; bounds memory and sets the progress granularity
+EXPORT_BLOCK_ROWS = 65536
+
+
+def merge_timeline(series):
+    """Sorted union of the timestamps of every (name, times, values) series"""
+    times = [np.asarray(t, dtype=np.float64) for _, t, _ in series if len(t)]
+    if not times:
+        return np.zeros(0, dtype=np.float64)
+    return np.unique(np.concatenate(times))
+
+
+def shifted(load, offset):
+    """A series loader whose times are moved by offset"""
+    if not offset:
+        return load
+
+    def load_shifted():
+        times, values = load()
+        return times + offset, values
+    return load_shifted
+
+
+def align(timeline, times, values, mode=AS_OF):
+    """Values of one series at every timeline timestamp (NaN where there is none)"""
+    out = np.full(len(timeline), np.nan)
+    if not len(times):
+        return out
+    if mode == AS_OF:
+        index = np.searchsorted(times, timeline, side="right") - 1
+        valid = index >= 0
+    else:
+        index = np.searchsorted(times, timeline, side="left")
+        valid = index < len(times)
+        valid[valid] = times[index[valid]] == timeline[valid]
+    out[valid] = values[index[valid]]
+    return out
+
+
+class ExportJob:
+    """Write series to path (.npz for a NumPy archive, CSV otherwise) on a background thread
+
+    sources is a list of (name, load) taken on the GUI thread; load() returns
+    (times, values) and is called by the worker, so a recording on disk is read
+    off the GUI thread. on_progress(fraction) and on_finished(error) are called
+    from the worker; error is an empty string on success or cancel.
+    """
+
+    def __init__(self, sources, path, mode=AS_OF, on_progress=None, on_finished=None):
+        if mode not in ALIGN_MODES:
+            raise ValueError(f"Unknown alignment mode: {mode}")
+        self.sources = sources
+        self.series = []  # (name, times, values), loaded by the worker
+        self.path = path
+        self.mode = mode
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.cancelled = False
+        self.rows = 0
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="ExportJob", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        error = ""
+        try:
+            self.series = [(name,) + tuple(load()) for name, load in self.sources]
+            timeline = merge_timeline(self.series)
+            self.rows = len(timeline)
+            if self.path.lower().endswith(".npz"):
+                self.write_npz(timeline)
+            else:
+                self.write_csv(timeline)
+            if self.cancelled and os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            error = str(e)
+        if self.on_finished:
+            self.on_finished(error)
+
+    def blocks(self, timeline):
+        """Yield (start, end, aligned columns) per block of rows until done or cancelled"""
+        total = len(timeline)
+        for start in range(0, total, EXPORT_BLOCK_ROWS):
+            if self.cancelled:
+                return
+            end = min(start + EXPORT_BLOCK_ROWS, total)
+            rows = timeline[start:end]
+            columns = [align(rows, times, values, self.mode) for _, times, values in self.series]
+            yield start, end, columns
+            if self.on_progress:
+                self.on_progress(end / total)
+
+    def write_csv(self, timeline):
+        row_format = ",".join(["%.6f"] + ["%.9g"] * len(self.series)) + "\n"
+        with open(self.path, "w", newline="") as f:
+            # Names come from topics and keys: let csv quote commas and quotes
+            csv.writer(f, lineterminator="\n").writerow(["Time (s)"] + [name for name, _, _ in self.series])
+            for start, end, columns in self.blocks(timeline):
+                table = np.column_stack([timeline[start:end]] + columns)
+                # One format call per block instead of one per row
+                text = (row_format * (end - start)) % tuple(table.ravel().tolist())
+                # Missing samples are written as empty cells
+                f.write(text.replace("nan", ""))
+
+    def write_npz(self, timeline):
+        arrays = {name: np.empty(len(timeline)) for name, _, _ in self.series}
+        for start, end, columns in self.blocks(timeline):
+            for (name, _, _), column in zip(self.series, columns):
+                arrays[name][start:end] = column
+        if self.cancelled:
+            return
+        # Same layout as np.savez, without its restrictions on array names
+        with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+            for name, array in [("Time (s)", timeline)] + list(arrays.items()):
+                with archive.open(name + ".npy", "w", force_zip64=True) as f:
+                    np.lib.format.write_array(f, array)
@@ -3,12 +3,22 @@ import json
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator, AutoMinorLocator
 import numpy as np
-import csv
 import os
-import time
 from datetime import datetime
 import math
+from series_store import RecordingBuffer, format_bytes
+from message_decoder import wall_now
+from session_file import DiskRecording
+from decimation import pyramid_for, minmax_decimate
+from export_dialog import export_series
+from exporter import shifted
+from config import (RECORDING_BACKEND, RECORDING_DIR, RECORDING_DISPLAY_INTERVAL_MS, GRAPH_X_HEADROOM_S,
+                    GRAPH_MIN_VIEW_S)
+
+# Channel of a variable's receive delays in a session file
+RECEIVE_DELAY_SUFFIX = "#receive_delay"
 
 class GraphWidget(QtWidgets.QWidget):
     def __init__(self, parent=None, graph_id=0):
@@ -16,11 +26,23 @@ class GraphWidget(QtWidgets.QWidget):
         self.parent = parent
         self.graph_id = graph_id
         self.is_recording = False
+        self.has_recording = False  # a stopped recording is on screen until reset
         self.start_time = 0
-        self.last_update_time = 0
-        self.update_interval = 0.025  # Bước nhảy 0.2s
+        self.last_display_time = 0
+        self.display_interval = RECORDING_DISPLAY_INTERVAL_MS / 1000.0  # screen refresh while recording
         self.selected_variables = []
-        self.record_data = {}
+        self.record_data = {}  # variable -> RecordingBuffer or DiskChannel
+        self.receive_delay = {}  # variable -> receive time - sample time, for device-timestamped samples
+        self.last_record_time = {}  # variable -> newest recorded time, keeps recordings sorted
+        self.disk_recording = None  # session file of the current recording (disk backend)
+        self.pyramids = {}  # variable -> LodPyramid or ChunkPyramid over its record_data buffer
+        self.view_range = None  # (t_start, t_end) zoomed into on a stopped recording
+        self.pan_start = None
+        
+        # Persistent line artists, redrawn by blitting over a cached background
+        self.lines = {}
+        self.background = None
+        self.title_text = None
         
         # Main layout for graph widget
         self.layout = QtWidgets.QVBoxLayout()
@@ -51,10 +73,16 @@ class GraphWidget(QtWidgets.QWidget):
         self.canvas.setMinimumHeight(400)  # Tăng chiều cao tối thiểu từ 200 lên 400
         self.canvas.setMaximumHeight(600)  # Tăng chiều cao tối đa từ 200 lên 500
         self.ax = self.figure.add_subplot(111)
-        self.ax.set_title(f'Graph {self.graph_id}')
-        self.ax.set_xlabel('Time (s)')
-        self.ax.set_ylabel('Value')
-        self.ax.grid(True)
+        self.setup_axes(f'Graph {self.graph_id}')
+        
+        # Recapture the static background whenever the canvas is fully redrawn (e.g. resize)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        
+        # Zoom (wheel), pan (drag) and full view (double click) on a stopped recording
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
         
         # Add to layout
         self.layout.addWidget(self.canvas)
@@ -68,6 +96,9 @@ class GraphWidget(QtWidgets.QWidget):
         self.variable_selector = QtWidgets.QComboBox()
         self.variable_selector.setFixedHeight(20)
         self.variable_selector.setPlaceholderText("Select variable")
+        if self.parent and hasattr(self.parent, "variable_registry"):
+            # One model for all graphs: new variables appear in every selector at once
+            self.variable_selector.setModel(self.parent.variable_registry.model)
         self.control_layout.addWidget(self.variable_selector)
         
         # Add button
@@ -112,6 +143,10 @@ class GraphWidget(QtWidgets.QWidget):
         self.selected_list = QtWidgets.QLabel("None")
         self.selected_layout.addWidget(self.selected_list)
         
+        # Memory used by the recording buffers of this graph
+        self.memory_label = QtWidgets.QLabel("Mem: 0 B")
+        self.selected_layout.addWidget(self.memory_label)
+        
         self.remove_button = QtWidgets.QPushButton("×")
         self.remove_button.setFixedSize(20, 20)
         self.remove_button.clicked.connect(self.remove_variable)
@@ -128,30 +163,33 @@ class GraphWidget(QtWidgets.QWidget):
     def remove_graph(self):
         """Remove this graph from parent visualization"""
         if self.parent and hasattr(self.parent, "graphs"):
+            self.close_disk_recording()
+            
             # Remove from parent's graph list
             if self in self.parent.graphs:
                 self.parent.graphs.remove(self)
             
+            # Stop receiving samples and repaint frames
+            if hasattr(self.parent, "unsubscribe_all"):
+                self.parent.unsubscribe_all(self)
+            if hasattr(self.parent, "scheduler"):
+                self.parent.scheduler.remove_target(self)
+            
             # Remove widget from layout
             self.setParent(None)
             self.deleteLater()
     
-    def update_variable_selector(self, variables):
-        """Update the variable selector with new variables"""
-        current_items = [self.variable_selector.itemText(i) for i in range(self.variable_selector.count())]
-        for var in variables:
-            if var not in current_items:
-                self.variable_selector.addItem(var)
-    
     def add_variable(self):
         """Add selected variable to the graph"""
         variable = self.variable_selector.currentText()
         if variable and variable not in self.selected_variables:
             self.selected_variables.append(variable)
+            if self.parent and hasattr(self.parent, "subscribe"):
+                self.parent.subscribe(self, variable)
             self.update_selected_list()
             # Create entry in record data
             if variable not in self.record_data:
-                self.record_data[variable] = {'time': [], 'value': []}
+                self.record_data[variable] = self.new_record_buffer(variable)
     
     def remove_variable(self):
         """Remove variable from graph"""
@@ -165,8 +203,13 @@ class GraphWidget(QtWidgets.QWidget):
         
         if ok and item:
             self.selected_variables.remove(item)
+            if self.parent and hasattr(self.parent, "unsubscribe"):
+                self.parent.unsubscribe(self, item)
             if item in self.record_data:
                 del self.record_data[item]
+            self.receive_delay.pop(item, None)
+            self.last_record_time.pop(item, None)
+            self.pyramids.pop(item, None)
             self.update_selected_list()
             self.update_graph()
     
@@ -177,6 +220,42 @@ class GraphWidget(QtWidgets.QWidget):
         else:
             self.selected_list.setText("None")
     
+    def new_record_buffer(self, variable):
+        """Create the record_data entry for variable using the active recording backend"""
+        if self.disk_recording is not None:
+            return self.disk_recording.channel(variable)
+        return RecordingBuffer()
+    
+    def new_recording_path(self):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(RECORDING_DIR, f"graph{self.graph_id}_{timestamp}.rbcs")
+    
+    def flush_disk_recording(self):
+        """Frame hook: write pending samples once they are RECORDING_FLUSH_INTERVAL_S old, even if the stream stalls"""
+        if self.disk_recording is not None:
+            self.disk_recording.flush_if_due()
+    
+    def close_disk_recording(self):
+        if self.disk_recording is not None:
+            scheduler = getattr(self.parent, "scheduler", None)
+            if scheduler is not None:
+                scheduler.remove_frame_hook(self.flush_disk_recording)
+            self.disk_recording.close()
+            if self.disk_recording.writer is not None:
+                print(f"Recording saved to {self.disk_recording.path}")
+            self.disk_recording = None
+    
+    def memory_usage(self):
+        """Bytes allocated by this graph's recording buffers"""
+        buffers = list(self.record_data.values()) + list(self.receive_delay.values())
+        return sum(buffer.nbytes for buffer in buffers)
+    
+    def update_memory_label(self):
+        text = f"Mem: {format_bytes(self.memory_usage())}"
+        if self.disk_recording is not None:
+            text += f" | Disk: {format_bytes(self.disk_recording.disk_bytes())}"
+        self.memory_label.setText(text)
+    
     def start_recording(self):
         """Start recording data"""
         if not self.selected_variables:
@@ -184,22 +263,28 @@ class GraphWidget(QtWidgets.QWidget):
             return
             
         self.is_recording = True
-        self.start_time = time.time()
-        self.last_update_time = 0  # Reset thời điểm cập nhật cuối
+        self.has_recording = False
+        self.start_time = wall_now()
+        self.last_display_time = 0  # Reset thời điểm cập nhật cuối
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         
         # Reset dữ liệu ghi
+        self.close_disk_recording()
+        if RECORDING_BACKEND == "disk":
+            self.disk_recording = DiskRecording(self.new_recording_path())
+            scheduler = getattr(self.parent, "scheduler", None)
+            if scheduler is not None:
+                scheduler.add_frame_hook(self.flush_disk_recording)
+        self.receive_delay = {}
+        self.last_record_time = {}
         for var in self.selected_variables:
-            self.record_data[var] = {'time': [], 'value': []}
+            self.record_data[var] = self.new_record_buffer(var)
             
         # Reset biểu đồ
-        self.ax.clear()
-        self.ax.set_title(f'Graph {self.graph_id} - Recording')
-        self.ax.set_xlabel('Time (s)')
-        self.ax.set_ylabel('Value')
-        self.ax.grid(True)
+        self.setup_axes(f'Graph {self.graph_id} - Recording')
         self.canvas.draw()
+        self.update_memory_label()
 
     def stop_recording(self):
         """Stop recording data and rescale the graph to show all data from 0.0s"""
@@ -207,51 +292,29 @@ class GraphWidget(QtWidgets.QWidget):
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         
+        if self.disk_recording is not None:
+            self.disk_recording.flush()
+        
         # Kiểm tra xem có dữ liệu để hiển thị không
         has_data = False
         for var in self.selected_variables:
-            if var in self.record_data and self.record_data[var]['time']:
+            if var in self.record_data and len(self.record_data[var]):
                 has_data = True
                 break
                 
+        self.has_recording = has_data
+        self.update_memory_label()
         if has_data:
             # Cập nhật biểu đồ để hiển thị tất cả dữ liệu đã ghi
-            self.ax.clear()
-            
-            # Vẽ dữ liệu của mỗi biến
-            for var in self.selected_variables:
-                if var in self.record_data and self.record_data[var]['time']:
-                    self.ax.plot(
-                        self.record_data[var]['time'],
-                        self.record_data[var]['value'],
-                        label=var
-                    )
+            self.setup_axes(f'Graph {self.graph_id} - Stopped')
+            bounds = self.update_lines()
                     
             # Đặt phạm vi trục X từ 0 đến thời gian tối đa đã ghi
-            max_time = 0
-            for var in self.selected_variables:
-                if var in self.record_data and self.record_data[var]['time']:
-                    if self.record_data[var]['time']:
-                        max_time = max(max_time, max(self.record_data[var]['time']))
-            
             # Làm tròn max_time lên 1.0s gần nhất để biểu đồ đẹp hơn
-            max_time = math.ceil(max_time)
+            max_time = math.ceil(bounds[1]) if bounds else 1
             self.ax.set_xlim(0, max_time)
-            
-            # Tạo các điểm đánh dấu trục x với bước 0.2s
-            x_ticks = np.arange(0, max_time + self.update_interval, self.update_interval)
-            self.ax.set_xticks(x_ticks)
-            
-            # Chỉ hiển thị nhãn cho các giây chẵn để tránh quá nhiều nhãn
-            x_tick_labels = [f"{x:.1f}" if x % 1.0 == 0 else "" for x in x_ticks]
-            self.ax.set_xticklabels(x_tick_labels)
-            
-            # Cập nhật tiêu đề và nhãn
-            self.ax.set_title(f'Graph {self.graph_id} - Stopped')
-            self.ax.set_xlabel('Time (s)')
-            self.ax.set_ylabel('Value')
-            self.ax.grid(True)
-            self.ax.legend()
+            if bounds:
+                self.ax.set_ylim(*self.padded_range(bounds[2], bounds[3]))
             
             # Buộc vẽ lại với tỷ lệ đã cập nhật
             self.canvas.draw()
@@ -259,155 +322,334 @@ class GraphWidget(QtWidgets.QWidget):
             print(f"Graph {self.graph_id} stopped and rescaled to show full data from 0.0s to {max_time}s")
         else:
             self.ax.set_title(f'Graph {self.graph_id} - Stopped (No Data)')
+            self.title_text = self.ax.get_title()
             self.canvas.draw()
     
+    def open_recording(self, path):
+        """Show a saved session file as a stopped recording; samples are read from disk as they are drawn"""
+        recording = DiskRecording.open(path)
+        names = recording.names()
+        if not names:
+            recording.close()
+            raise ValueError("The session file has no recorded channels")
+        
+        if self.is_recording:
+            self.stop_recording()
+        self.close_disk_recording()
+        for var in self.selected_variables:
+            if self.parent and hasattr(self.parent, "unsubscribe"):
+                self.parent.unsubscribe(self, var)
+        
+        self.disk_recording = recording
+        self.selected_variables = [name for name in names if not name.endswith(RECEIVE_DELAY_SUFFIX)]
+        self.record_data = {var: recording.channel(var) for var in self.selected_variables}
+        self.receive_delay = {name[:-len(RECEIVE_DELAY_SUFFIX)]: recording.channel(name)
+                              for name in names if name.endswith(RECEIVE_DELAY_SUFFIX)}
+        self.last_record_time = {}
+        self.pyramids = {}
+        self.view_range = None
+        # Start records the same variables live again
+        for var in self.selected_variables:
+            if self.parent and hasattr(self.parent, "subscribe"):
+                self.parent.subscribe(self, var)
+        self.update_selected_list()
+        
+        self.has_recording = True
+        self.setup_axes(f'Graph {self.graph_id} - {os.path.basename(path)}')
+        self.show_full_range()
+        self.update_memory_label()
+    
     def reset_graph(self):
         """Reset the graph"""
         self.is_recording = False
+        self.has_recording = False
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         
-        # Reset record data
+        # Reset record data (a disk recording stays on disk)
+        self.close_disk_recording()
+        self.receive_delay = {}
+        self.last_record_time = {}
         for var in self.selected_variables:
-            self.record_data[var] = {'time': [], 'value': []}
+            self.record_data[var] = self.new_record_buffer(var)
             
         # Reset graph
-        self.ax.clear()
-        self.ax.set_title(f'Graph {self.graph_id}')
-        self.ax.set_xlabel('Time (s)')
-        self.ax.set_ylabel('Value')
-        self.ax.grid(True)
+        self.setup_axes(f'Graph {self.graph_id}')
         self.canvas.draw()
+        self.update_memory_label()
+    
+    def export_series(self, prefix="", offset=0.0):
+        """[(name, load)] of the recorded variables for an ExportJob; times are shifted by offset
+
+        Nothing is read here: a disk recording is loaded by the export thread.
+        """
+        series = []
+        for var in self.selected_variables:
+            buffer = self.record_data.get(var)
+            if buffer is None or not len(buffer):
+                continue
+            series.append((prefix + var, shifted(buffer.snapshot(), offset)))
+            delay = self.receive_delay.get(var)
+            if delay is not None and len(delay):
+                series.append((f"{prefix}{var} receive delay (s)", shifted(delay.snapshot(), offset)))
+        return series
     
     def export_data(self):
-        """Export recorded data to CSV"""
-        if not any(self.record_data.values()):
+        """Export recorded data to CSV or NPZ in the background"""
+        series = self.export_series()
+        if not series:
             QtWidgets.QMessageBox.warning(self, "No Data", "No data to export.")
             return
-            
-        # Open file dialog to choose save location
-        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            self, "Save Data", "", "CSV Files (*.csv);;All Files (*)"
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    
-                    # Create header row with time and all variables
-                    header = ['Time (s)']
-                    for var in self.selected_variables:
-                        if var in self.record_data and self.record_data[var]['time']:
-                            header.append(var)
-                    
-                    writer.writerow(header)
-                    
-                    # Find the max number of data points
-                    max_points = 0
-                    for var in self.selected_variables:
-                        if var in self.record_data:
-                            max_points = max(max_points, len(self.record_data[var]['time']))
-                    
-                    # Write data rows
-                    for i in range(max_points):
-                        row = []
-                        
-                        # Add time
-                        for var in self.selected_variables:
-                            if var in self.record_data and i < len(self.record_data[var]['time']):
-                                row.append(self.record_data[var]['time'][i])
-                                break
-                        else:
-                            row.append('')
-                        
-                        # Add values for each variable
-                        for var in self.selected_variables:
-                            if var in self.record_data and i < len(self.record_data[var]['value']):
-                                row.append(self.record_data[var]['value'][i])
-                            else:
-                                row.append('')
-                        
-                        writer.writerow(row)
-                
-                QtWidgets.QMessageBox.information(self, "Export Successful", "Data exported successfully!")
-                
-            except Exception as e:
-                QtWidgets.QMessageBox.critical(self, "Export Error", f"Error exporting data: {str(e)}")
+        export_series(self, series)
     
-    def update_data(self, variable, value):
-        """Update data for a variable if it's selected for this graph"""
-        if variable not in self.selected_variables:
-            return
-        
-        current_time = time.time()
+    def update_data(self, variable, value, timestamp=None, receive_time=None):
+        """Update data for a variable selected for this graph (the parent only dispatches those)
+
+        timestamp is the sample time (device time when the payload has one,
+        else the receive time); every sample is recorded with it, only the
+        repaint is throttled to display_interval. receive_time is given for
+        device-timestamped samples and recorded as a receive delay.
+        """
+        if timestamp is None:
+            timestamp = wall_now()
         
-        # Tính thời điểm hiển thị
         if self.is_recording:
             # Tính thời gian tương đối từ khi bắt đầu ghi
-            elapsed_time = current_time - self.start_time
-            
-            # Xác định thời điểm hiển thị kế tiếp dựa trên bước nhảy
-            display_time = self.last_update_time + self.update_interval
-            
-            # Nếu chưa đến thời điểm cập nhật kế tiếp, bỏ qua
-            if elapsed_time < display_time:
-                return
-                
-            # Cập nhật thời điểm cuối cùng được hiển thị
-            self.last_update_time = int(elapsed_time / self.update_interval) * self.update_interval
+            elapsed_time = timestamp - self.start_time
+            # A key fed by several topics may arrive slightly out of order; recordings stay sorted
+            last = self.last_record_time.get(variable)
+            if last is not None and elapsed_time < last:
+                elapsed_time = last
+            self.last_record_time[variable] = elapsed_time
             
             # Cập nhật dữ liệu
             if variable not in self.record_data:
-                self.record_data[variable] = {'time': [], 'value': []}
+                self.record_data[variable] = self.new_record_buffer(variable)
                 
-            self.record_data[variable]['time'].append(self.last_update_time)
-            self.record_data[variable]['value'].append(value)
-        else:
-            # Trong chế độ xem (không ghi), hiển thị dữ liệu với bước nhảy đều
-            if variable not in self.record_data:
-                self.record_data[variable] = {'time': [], 'value': []}
+            self.record_data[variable].append(elapsed_time, value)
+            if receive_time is not None:
+                delay = self.receive_delay.get(variable)
+                if delay is None:
+                    delay = self.receive_delay[variable] = self.new_record_buffer(variable + RECEIVE_DELAY_SUFFIX)
+                delay.append(elapsed_time, receive_time - timestamp)
             
-            # Thêm dữ liệu mới
-            if not self.record_data[variable]['time']:
-                next_time = 0
-            else:
-                next_time = self.record_data[variable]['time'][-1] + self.update_interval
-                
-            self.record_data[variable]['time'].append(next_time)
-            self.record_data[variable]['value'].append(value)
-            
-            # Giới hạn số lượng điểm hiển thị khi không ghi
-            max_points = 50  # Giữ 50 điểm dữ liệu gần nhất
-            if len(self.record_data[variable]['time']) > max_points:
-                self.record_data[variable]['time'].pop(0)
-                self.record_data[variable]['value'].pop(0)
+            # Nếu chưa đến thời điểm cập nhật màn hình kế tiếp, chỉ ghi dữ liệu
+            if elapsed_time - self.last_display_time < self.display_interval:
+                return
+            self.last_display_time = elapsed_time
+        elif self.has_recording:
+            # Giữ nguyên dữ liệu đã ghi trên màn hình cho đến khi reset
+            return
         
-        # Cập nhật biểu đồ
-        self.update_graph()
+        # Trong chế độ xem (không ghi), dữ liệu được đọc trực tiếp từ series store dùng chung
+        # Cập nhật biểu đồ ở frame kế tiếp
+        self.request_redraw()
+    
+    def request_redraw(self):
+        """Mark this graph dirty so it is repainted once on the next frame"""
+        scheduler = getattr(self.parent, "scheduler", None)
+        if scheduler is not None:
+            scheduler.mark_dirty(self)
+        else:
+            self.update_graph()
     
     def update_graph(self):
         """Update the graph with new data"""
         if not self.selected_variables:
+            if self.lines:
+                self.setup_axes(f'Graph {self.graph_id}')
+                self.canvas.draw()
             return
-            
-        self.ax.clear()
         
-        # Plot each variable
-        for var in self.selected_variables:
-            if var in self.record_data and self.record_data[var]['time']:
-                self.ax.plot(
-                    self.record_data[var]['time'], 
-                    self.record_data[var]['value'], 
-                    label=var
-                )
-        
-        # Update labels and legend
-        self.ax.set_title(f'Graph {self.graph_id}' + (' - Recording' if self.is_recording else ''))
+        title = f'Graph {self.graph_id}' + (' - Recording' if self.is_recording else '')
+        full_redraw = False
+        
+        # Title or variable set changed: rebuild the static layer
+        if title != self.title_text or list(self.lines) != self.selected_variables:
+            self.setup_axes(title)
+            full_redraw = True
+        
+        bounds = self.update_lines()
+        if bounds and self.update_limits(*bounds):
+            full_redraw = True
+        
+        if full_redraw or self.background is None:
+            self.canvas.draw()
+        else:
+            self.blit_lines()
+        
+        if self.is_recording:
+            self.update_memory_label()
+    
+    def setup_axes(self, title):
+        """Rebuild title, labels, grid, legend and one persistent line per selected variable"""
+        self.ax.clear()
+        self.ax.set_title(title)
         self.ax.set_xlabel('Time (s)')
         self.ax.set_ylabel('Value')
         self.ax.grid(True)
-        self.ax.legend()
+        # Tick spacing follows the visible span, whatever the length of the recording
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins='auto', steps=[1, 2, 2.5, 5, 10]))
+        self.ax.xaxis.set_minor_locator(AutoMinorLocator())
         
-        # Redraw
-        self.canvas.draw()
\ No newline at end of file
+        self.lines = {}
+        for var in self.selected_variables:
+            line, = self.ax.plot([], [], label=var, animated=True)
+            self.lines[var] = line
+        if self.lines:
+            self.ax.legend()
+        
+        self.title_text = title
+        self.background = None
+        self.view_range = None
+        self.y_fitted = False  # y-limits not yet fitted to data
+    
+    def update_lines(self):
+        """Push the current data into the line artists and return (xmin, xmax, ymin, ymax) or None"""
+        bounds = None
+        for var, line in self.lines.items():
+            times, values = self.get_series(var)
+            if not len(times):
+                line.set_data([], [])
+                continue
+            line.set_data(times, values)
+            
+            var_bounds = (np.min(times), np.max(times), np.min(values), np.max(values))
+            if bounds is None:
+                bounds = var_bounds
+            else:
+                bounds = (min(bounds[0], var_bounds[0]), max(bounds[1], var_bounds[1]),
+                          min(bounds[2], var_bounds[2]), max(bounds[3], var_bounds[3]))
+        return bounds
+    
+    def get_series(self, var):
+        """Return (times, values) to plot: the recording, or the shared live buffer"""
+        if self.is_recording or self.has_recording:
+            buffer = self.record_data.get(var)
+            if buffer is None:
+                return [], []
+            pyramid = self.pyramids.get(var)
+            if pyramid is None or pyramid.source is not buffer:
+                pyramid = self.pyramids[var] = pyramid_for(buffer)
+            pyramid.update()
+            span = pyramid.time_range()
+            if span is None:
+                return [], []
+            if self.view_range is not None:
+                # Only the visible range, plus a margin so lines reach the plot edges
+                t_start, t_end = self.view_range
+                margin = 0.05 * (t_end - t_start)
+                span = (t_start - margin, t_end + margin)
+            return self.decimated(pyramid, span[0], span[1])
+        
+        store = getattr(self.parent, "series_store", None)
+        if store is None:
+            return [], []
+        return store.window(var)
+    
+    def plot_width(self):
+        """Width of the plot area in pixels"""
+        return max(100, int(self.ax.bbox.width))
+    
+    def decimated(self, pyramid, t_start, t_end):
+        """(times, values) of [t_start, t_end] reduced to about two points per pixel column"""
+        width = self.plot_width()
+        times, values = pyramid.window(t_start, t_end, 4 * width)
+        return minmax_decimate(times, values, width)
+    
+    def padded_range(self, low, high, before=0.1, after=0.1):
+        """Return a (low, high) range with some headroom around the data"""
+        span = high - low
+        if span <= 0:
+            span = max(abs(high), 1.0)
+        return low - span * before, high + span * after
+    
+    def update_limits(self, xmin, xmax, ymin, ymax):
+        """Change axis limits only when the data leaves them; return True if they changed"""
+        changed = False
+        
+        # Every change is a full redraw, so each one leaves room for many frames of new data
+        x_low, x_high = self.ax.get_xlim()
+        x_span = xmax - xmin
+        headroom = max(x_span, GRAPH_X_HEADROOM_S)
+        if xmin < x_low or xmax > x_high or (x_high - x_low) > 4 * (x_span + headroom):
+            # The axis jumps ahead by at least GRAPH_X_HEADROOM_S, not with every sample
+            self.ax.set_xlim(xmin, xmax + headroom)
+            changed = True
+        
+        y_low, y_high = self.ax.get_ylim()
+        if not self.y_fitted or (changed and (ymax - ymin) < 0.25 * (y_high - y_low)):
+            # First data, or shrink to the data along with a time axis jump (already a full redraw)
+            self.ax.set_ylim(*self.padded_range(ymin, ymax, before=0.25, after=0.25))
+            self.y_fitted = True
+            changed = True
+        elif ymin < y_low or ymax > y_high:
+            # Grow to cover both the old range and the data, so drifting data does not move it every frame
+            low, high = self.padded_range(ymin, ymax, before=0.25, after=0.25)
+            self.ax.set_ylim(min(low, y_low), max(high, y_high))
+            changed = True
+        
+        return changed
+    
+    def can_navigate(self):
+        return self.has_recording and not self.is_recording
+    
+    def set_view(self, t_start, t_end):
+        """Show [t_start, t_end] of the stopped recording, loading only that range"""
+        if t_end - t_start < GRAPH_MIN_VIEW_S:
+            return
+        self.view_range = (t_start, t_end)
+        self.ax.set_xlim(t_start, t_end)
+        bounds = self.update_lines()
+        if bounds:
+            self.ax.set_ylim(*self.padded_range(bounds[2], bounds[3]))
+        self.canvas.draw_idle()
+    
+    def show_full_range(self):
+        self.view_range = None
+        bounds = self.update_lines()
+        if bounds:
+            self.ax.set_xlim(0, math.ceil(bounds[1]))
+            self.ax.set_ylim(*self.padded_range(bounds[2], bounds[3]))
+        self.canvas.draw_idle()
+    
+    def on_scroll(self, event):
+        if not self.can_navigate() or event.inaxes is not self.ax or event.xdata is None:
+            return
+        # Zoom around the cursor
+        factor = 0.8 if event.button == 'up' else 1.25
+        x_low, x_high = self.ax.get_xlim()
+        self.set_view(event.xdata - (event.xdata - x_low) * factor,
+                      event.xdata + (x_high - event.xdata) * factor)
+    
+    def on_press(self, event):
+        if not self.can_navigate() or event.inaxes is not self.ax or event.button != 1:
+            return
+        if event.dblclick:
+            self.show_full_range()
+            return
+        self.pan_start = (event.x, self.ax.get_xlim())
+    
+    def on_motion(self, event):
+        if self.pan_start is None or event.x is None:
+            return
+        start_x, (x_low, x_high) = self.pan_start
+        # Pixel distance keeps panning stable while the limits move under the cursor
+        shift = (event.x - start_x) * (x_high - x_low) / self.ax.bbox.width
+        self.set_view(x_low - shift, x_high - shift)
+    
+    def on_release(self, event):
+        self.pan_start = None
+    
+    def on_draw(self, event):
+        """Cache the static background after a full redraw and paint the lines on top"""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+    
+    def blit_lines(self):
+        """Repaint only the line artists over the cached background"""
+        self.canvas.restore_region(self.background)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
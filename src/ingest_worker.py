@@ -0,0 +1,278 @@
+"""
+Ingest worker for MQTT Monitoring App
+Decodes messages on a dedicated thread and hands them to the GUI in batches
+"""
+
+import threading
+import time
+from collections import deque
+from config import INGEST_QUEUE_SIZE, INGEST_OVERLOAD_POLICY
+from message_decoder import decode_records, DeviceClock
+from latency_stats import pipeline_latency, DECODE, NETWORK, HANDOFF, RECEIVE_TO_GUI, UPDATE
+
+# Overload policies, applied when the queue is full
+DROP_OLDEST = "drop_oldest"   # discard the oldest pending message
+KEEP_LATEST = "keep_latest"   # discard an older pending message from the same topic
+BLOCK = "block"               # make the network thread wait for room
+OVERLOAD_POLICIES = (DROP_OLDEST, KEEP_LATEST, BLOCK)
+
+# Messages the decode thread takes from the queue at a time
+DECODE_BATCH = 256
+
+
+class IngestWorker:
+    """Bounded queue between the paho network thread and the GUI thread"""
+
+    def __init__(self, max_queue=INGEST_QUEUE_SIZE, policy=INGEST_OVERLOAD_POLICY, decoder=decode_records):
+        if policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"Unknown overload policy: {policy}")
+        self.max_queue = max(1, int(max_queue))
+        self.policy = policy
+        self.decoder = decoder
+        self.device_clock = DeviceClock()  # only touched by the decode thread
+
+        # Queued entries are one-item slots: [(topic, payload, receive_ns)] in raw, [record] in ready.
+        # A dropped entry is emptied in place ([None]) and skipped when its queue is read.
+        self.raw = deque()    # messages waiting to be decoded
+        self.ready = deque()  # decoded records waiting for the GUI
+        self.raw_held = 0     # live slots in raw
+        self.ready_held = 0   # live slots in ready
+        self.in_flight = 0    # messages taken by the decode thread and not yet in ready
+        # topic -> its live slots, oldest first, so keep_latest finds one without a scan
+        self.raw_by_topic = {}
+        self.ready_by_topic = {}
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+        # Counters
+        self.received = 0
+        self.decoded = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+        self.running = False
+        self.finishing = False  # decode what is queued before the thread exits
+        self.thread = None
+
+    def start(self):
+        """Start the decode thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="IngestWorker", daemon=True)
+        self.thread.start()
+
+    def stop(self, finish=False):
+        """Stop the decode thread and release any blocked producer
+
+        With finish, the messages still waiting are decoded into ready first, so a
+        final drain() gets them; otherwise they are left undecoded.
+        """
+        with self.lock:
+            self.running = False
+            self.finishing = finish
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+        if self.thread is not None:
+            # The queue is bounded, so finishing takes at most one queue's worth of decoding
+            self.thread.join(timeout=None if finish else 1.0)
+            self.thread = None
+
+    def depth(self):
+        """Messages held between the network and GUI threads, including the batch being decoded"""
+        return self.raw_held + self.in_flight + self.ready_held
+
+    def submit(self, topic, payload, receive_ns=None):
+        """Queue a raw message; called from the network thread"""
+        if receive_ns is None:
+            receive_ns = time.monotonic_ns()
+        with self.lock:
+            self.received += 1
+            if self.depth() >= self.max_queue:
+                if self.policy == BLOCK:
+                    while self.running and self.depth() >= self.max_queue:
+                        self.not_full.wait(0.1)
+                    if self.depth() >= self.max_queue:
+                        self.dropped += 1
+                        return False
+                elif not (self.drop_same_topic(topic) if self.policy == KEEP_LATEST else self.drop_oldest()):
+                    # Everything held is being decoded; the new message is the one dropped
+                    self.dropped += 1
+                    return False
+
+            slot = [(topic, payload, receive_ns)]
+            self.raw.append(slot)
+            self.raw_held += 1
+            self.index(self.raw_by_topic, topic, slot)
+            self.max_depth = max(self.max_depth, self.depth())
+            self.not_empty.notify()
+        return True
+
+    def drop_oldest(self):
+        """Discard the oldest pending message; lock must be held. False if only the batch in flight is held"""
+        if self.ready_held:
+            self.drop_ready(self.first_live(self.ready))
+        elif self.raw_held:
+            self.drop_raw(self.first_live(self.raw))
+        else:
+            return False
+        self.dropped += 1
+        return True
+
+    def drop_same_topic(self, topic):
+        """Discard the oldest pending message from topic, or the oldest overall; lock must be held"""
+        if topic in self.ready_by_topic:
+            self.drop_ready(self.ready_by_topic[topic][0])
+        elif topic in self.raw_by_topic:
+            self.drop_raw(self.raw_by_topic[topic][0])
+        else:
+            return self.drop_oldest()
+        self.dropped += 1
+        return True
+
+    @staticmethod
+    def first_live(queue):
+        """Pop emptied slots off the front of queue and return the first live one"""
+        while queue[0][0] is None:
+            queue.popleft()
+        return queue[0]
+
+    @staticmethod
+    def index(by_topic, topic, slot):
+        """Remember slot as the newest live slot of topic"""
+        slots = by_topic.get(topic)
+        if slots is None:
+            slots = by_topic[topic] = deque()
+        slots.append(slot)
+
+    @staticmethod
+    def unindex(by_topic, topic):
+        """Forget the oldest live slot of topic"""
+        slots = by_topic[topic]
+        slots.popleft()
+        if not slots:
+            del by_topic[topic]
+
+    def drop_ready(self, slot):
+        """Empty a live ready slot, the oldest of its topic"""
+        self.unindex(self.ready_by_topic, slot[0].topic)
+        slot[0] = None
+        self.ready_held -= 1
+        self.compact(self.ready, self.ready_held)
+
+    def drop_raw(self, slot):
+        """Empty a live raw slot, the oldest of its topic"""
+        self.unindex(self.raw_by_topic, slot[0][0])
+        slot[0] = None
+        self.raw_held -= 1
+        self.compact(self.raw, self.raw_held)
+
+    def compact(self, queue, held):
+        """Remove emptied slots once they outnumber the live ones by a queue's worth (amortised O(1) per drop)"""
+        if len(queue) > 2 * held + self.max_queue:
+            live = [slot for slot in queue if slot[0] is not None]
+            queue.clear()
+            queue.extend(live)
+
+    def run(self):
+        """Decode loop"""
+        while True:
+            with self.lock:
+                while self.running and not self.raw_held:
+                    self.not_empty.wait(0.1)
+                if not self.running and not (self.finishing and self.raw_held):
+                    return
+                # A bounded batch; it still counts towards depth() until it is in ready
+                raw = self.raw
+                items = []
+                while raw and len(items) < DECODE_BATCH:
+                    item = raw.popleft()[0]
+                    if item is not None:
+                        items.append(item)
+                        self.unindex(self.raw_by_topic, item[0])
+                self.raw_held -= len(items)
+                self.in_flight = len(items)
+
+            records = []
+            timed = pipeline_latency.enabled
+            for topic, payload, receive_ns in items:
+                try:
+                    if timed:
+                        start = time.perf_counter_ns()
+                    # A batched payload decodes to several records
+                    for record in self.device_clock.apply_all(self.decoder(topic, payload, receive_ns=receive_ns)):
+                        if timed:
+                            self.record_latency(record, start)
+                        records.append(record)
+                except Exception as e:
+                    print(f"Error decoding message on {topic}: {e}")
+
+            with self.lock:
+                for record in records:
+                    slot = [record]
+                    self.ready.append(slot)
+                    self.index(self.ready_by_topic, record.topic, slot)
+                self.ready_held += len(records)
+                self.decoded += len(records)
+                self.in_flight = 0
+                if len(records) < len(items):
+                    # Messages that failed to decode free their room
+                    self.not_full.notify_all()
+
+    def record_latency(self, record, start_ns):
+        """Decode time and, for device-stamped messages, device -> receive delay"""
+        pipeline_latency.record(DECODE, (time.perf_counter_ns() - start_ns) * 1e-9)
+        if record.device_time is not None:
+            pipeline_latency.record(NETWORK, record.receive_time - record.timestamp)
+        record.decoded_ns = time.monotonic_ns()
+
+    def drain(self):
+        """Return every decoded record in arrival order; called once per frame from the GUI thread"""
+        with self.lock:
+            if not self.ready:
+                return []
+            records = [slot[0] for slot in self.ready if slot[0] is not None]
+            self.ready.clear()
+            self.ready_by_topic.clear()
+            self.ready_held = 0
+            self.delivered += len(records)
+            self.not_full.notify_all()
+        return records
+
+    def dispatch(self, handle):
+        """Drain and call handle(record) for each record, timing the hand-off and handle when enabled"""
+        records = self.drain()
+        if not pipeline_latency.enabled:
+            for record in records:
+                handle(record)
+            return
+        now_ns = time.monotonic_ns()
+        for record in records:
+            if record.decoded_ns is not None:
+                pipeline_latency.record(HANDOFF, (now_ns - record.decoded_ns) * 1e-9)
+            pipeline_latency.record(RECEIVE_TO_GUI, (now_ns - record.receive_ns) * 1e-9)
+        for record in records:
+            start = time.perf_counter()
+            handle(record)
+            pipeline_latency.record(UPDATE, time.perf_counter() - start)
+
+    def reset_max_depth(self):
+        """Start a new peak depth measurement from the current depth"""
+        with self.lock:
+            self.max_depth = self.depth()
+
+    def get_stats(self):
+        """Return queue depth and counters"""
+        with self.lock:
+            return {
+                "policy": self.policy,
+                "depth": self.depth(),
+                "max_queue": self.max_queue,
+                "max_depth": self.max_depth,
+                "received": self.received,
+                "decoded": self.decoded,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+            }
@@ -0,0 +1,118 @@
+"""
+Pipeline latency statistics for MQTT Monitoring App
+Streaming log-scale histograms per stage; every call site checks enabled first,
+so the instrumentation costs one attribute lookup when it is off
+"""
+
+import json
+import math
+import threading
+import time
+from config import LATENCY_STATS_ENABLED
+
+# Pipeline stages, in message order
+NETWORK = "network"        # device timestamp -> receive on the network thread (device-stamped messages only)
+DECODE = "decode"          # payload -> MessageRecord in the ingest worker
+HANDOFF = "handoff"        # decoded -> drained by the GUI thread
+RECEIVE_TO_GUI = "receive_to_gui"  # receive -> drained by the GUI thread
+UPDATE = "update"          # table, history, map and graph bookkeeping for one record
+RENDER = "render"          # repainting the dirty views of one frame
+STAGES = (NETWORK, DECODE, HANDOFF, RECEIVE_TO_GUI, UPDATE, RENDER)
+
+
+class LatencyHistogram:
+    """Counts of latencies in log-spaced buckets from 1 us to 100 s (about 12% wide)"""
+
+    BUCKETS_PER_DECADE = 20
+    DECADES = 8
+    MIN_SECONDS = 1e-6
+
+    def __init__(self):
+        self.size = self.BUCKETS_PER_DECADE * self.DECADES + 2
+        self.counts = [0] * self.size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = int(math.log10(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_DECADE) + 1
+            if index >= self.size:
+                index = self.size - 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def upper_bound(self, index):
+        """Largest latency (s) counted in bucket index"""
+        return self.MIN_SECONDS * 10 ** (index / self.BUCKETS_PER_DECADE)
+
+    def percentile(self, p):
+        """Latency (s) below which p percent of the samples fall, or 0.0 without samples"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        """count, p50/p99/max/mean in milliseconds"""
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+            "mean_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+        }
+
+
+class PipelineLatency:
+    """One LatencyHistogram per pipeline stage"""
+
+    def __init__(self, enabled=LATENCY_STATS_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+            self.started = time.time()
+
+    def record(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(seconds)
+
+    def snapshot(self):
+        """stage -> summary dict, in pipeline order"""
+        return {stage: histogram.summary() for stage, histogram in list(self.histograms.items())}
+
+    def dump(self, path):
+        """Write the current statistics, with bucket counts, to a JSON file"""
+        data = {
+            "started": self.started,
+            "dumped": time.time(),
+            "stages": self.snapshot(),
+            "buckets": {
+                "min_seconds": LatencyHistogram.MIN_SECONDS,
+                "per_decade": LatencyHistogram.BUCKETS_PER_DECADE,
+                "counts": {stage: list(h.counts) for stage, h in list(self.histograms.items())},
+            },
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+# Shared by the network thread, the ingest worker and the GUI thread
+pipeline_latency = PipelineLatency()
@@ -3,35 +3,70 @@ import sys
 import paho.mqtt.client as mqtt
 from visualization import Visualization
 from mqtt_client import MqttClient
+from ingest_worker import IngestWorker
+from replay import StreamRecorder, StreamReader, StreamReplayer
 from config import (MQTT_BROKER, MQTT_PORT, MQTT_TOPIC, MQTT_USERNAME, MQTT_PASSWORD, MQTT_CLIENT_ID,
                    APP_TITLE, APP_VERSION, APP_WIDTH, APP_HEIGHT, APP_STYLE, DARK_PALETTE,
-                   COLOR_CONNECTED, COLOR_DISCONNECTED)
+                   COLOR_CONNECTED, COLOR_DISCONNECTED, RECORDING_DIR)
 from connection_dialog import ConnectionDialog
+from connection_settings import load_connection_settings, save_connection_settings
+from export_dialog import export_series
+from diagnostics_dialog import DiagnosticsDialog
+from latency_stats import pipeline_latency, RECEIVE_TO_GUI
+from table_model import SearchableListModel, IncrementalFilterProxy, TopicTreeModel
+from topic_trie import TopicTrie, is_pattern
 
 class TopicBrowserDialog(QtWidgets.QDialog):
     """Dialog to browse and select MQTT topics"""
-    def __init__(self, parent=None, topics=None):
+    def __init__(self, parent=None, topic_trie=None):
         super().__init__(parent)
         self.setWindowTitle("MQTT Topic Browser")
         self.setMinimumWidth(400)
         self.setMinimumHeight(300)
+        self.topic_trie = topic_trie if topic_trie is not None else TopicTrie()
         
         self.layout = QtWidgets.QVBoxLayout()
         self.setLayout(self.layout)
         
-        # Search box
+        # Search box: plain text filters, a +/# pattern previews its matches
         self.search_box = QtWidgets.QLineEdit()
-        self.search_box.setPlaceholderText("Search topics...")
+        self.search_box.setPlaceholderText("Search topics or preview a pattern (+, #)...")
         self.search_box.textChanged.connect(self.filter_topics)
         self.layout.addWidget(self.search_box)
         
-        # Topic list
-        self.topic_list = QtWidgets.QListWidget()
-        self.layout.addWidget(self.topic_list)
+        # Topic tree, expanded lazily level by level
+        self.tree_model = TopicTreeModel(self.topic_trie, self)
+        self.topic_tree = QtWidgets.QTreeView()
+        self.topic_tree.setModel(self.tree_model)
+        self.topic_tree.setUniformRowHeights(True)
+        self.topic_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.topic_tree.header().setStretchLastSection(False)
         
-        # Add topics if provided
-        if topics:
-            self.topic_list.addItems(topics)
+        # Flat search results; the list model is only built once a search starts
+        self.topic_model = None
+        self.topic_proxy = IncrementalFilterProxy(self)
+        self.topic_list = QtWidgets.QListView()
+        self.topic_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        
+        # Pattern preview
+        self.match_model = QtCore.QStringListModel(self)
+        self.match_list = QtWidgets.QListView()
+        self.match_list.setModel(self.match_model)
+        self.match_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        
+        self.views = QtWidgets.QStackedWidget()
+        self.views.addWidget(self.topic_tree)
+        self.views.addWidget(self.topic_list)
+        self.views.addWidget(self.match_list)
+        self.layout.addWidget(self.views)
+        
+        self.match_label = QtWidgets.QLabel(f"{len(self.topic_trie)} topics")
+        self.layout.addWidget(self.match_label)
+        
+        # Message counts change constantly; repaint the visible rows once a second
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self.topic_tree.viewport().update)
+        self.refresh_timer.start(1000)
             
         # Buttons
         button_layout = QtWidgets.QHBoxLayout()
@@ -44,26 +79,57 @@ class TopicBrowserDialog(QtWidgets.QDialog):
         button_layout.addWidget(self.cancel_button)
         self.layout.addLayout(button_layout)
     
+    def add_topic(self, topic):
+        """Show a topic detected while the dialog is open"""
+        self.tree_model.topic_added(topic)
+        if self.topic_model is not None:
+            self.topic_model.add_items([topic])
+        if not is_pattern(self.search_box.text()):
+            self.match_label.setText(f"{len(self.topic_trie)} topics")
+    
     def filter_topics(self, text):
-        """Filter the topic list by search text"""
-        for i in range(self.topic_list.count()):
-            item = self.topic_list.item(i)
-            if text.lower() in item.text().lower():
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        """Filter the topics by search text or preview the topics a pattern matches"""
+        if not text:
+            self.views.setCurrentWidget(self.topic_tree)
+            self.match_label.setText(f"{len(self.topic_trie)} topics")
+        elif is_pattern(text):
+            matches = self.topic_trie.match(text)
+            self.match_model.setStringList(sorted(matches))
+            self.views.setCurrentWidget(self.match_list)
+            self.match_label.setText(f"{len(matches)} matching topics")
+        else:
+            if self.topic_model is None:
+                self.topic_model = SearchableListModel(self.topic_trie.entries(), self)
+                self.topic_proxy.setSourceModel(self.topic_model)
+                self.topic_list.setModel(self.topic_proxy)
+            self.topic_proxy.set_query(text)
+            self.views.setCurrentWidget(self.topic_list)
+            self.match_label.setText(f"{self.topic_proxy.rowCount()} matching topics")
     
     def get_selected_topic(self):
-        """Return the selected topic or None"""
-        selected_items = self.topic_list.selectedItems()
-        if selected_items:
-            return selected_items[0].text()
+        """Return the selected topic, the pattern being previewed, or None"""
+        view = self.views.currentWidget()
+        selected = view.selectionModel().selectedIndexes() if view.selectionModel() else []
+        if selected:
+            if view is self.topic_tree:
+                return self.tree_model.node(selected[0]).path()
+            return view.model().data(selected[0])
+        if view is self.match_list:
+            return self.search_box.text()
         return None
 
 class MainApp(QtWidgets.QWidget):
+    replay_finished = QtCore.pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_TITLE)
+        
+        # Raw stream capture / replay
+        self.stream_recorder = None
+        self.replayer = None
+        self.diagnostics_dialog = None
+        self.replay_finished.connect(self.on_replay_finished)
         self.setGeometry(100, 100, APP_WIDTH, APP_HEIGHT)
         self.setWindowIcon(QtGui.QIcon.fromTheme("applications-system"))  # Fallback if icon missing
 
@@ -94,14 +160,25 @@ class MainApp(QtWidgets.QWidget):
         self.status_indicator.setFont(QtGui.QFont('', 8))
         self.status_indicator.setStyleSheet(f"color: {COLOR_DISCONNECTED}; font-weight: bold;")
         
+        # Render frame statistics
+        self.frame_label = QtWidgets.QLabel("Frame: -")
+        self.frame_label.setFont(QtGui.QFont('', 8))
+        
         self.connection_bar.addWidget(self.status_label)
         self.connection_bar.addStretch()
+        self.connection_bar.addWidget(self.frame_label)
+        
+        # Ingest queue statistics
+        self.ingest_label = QtWidgets.QLabel("Queue: 0")
+        self.ingest_label.setFont(QtGui.QFont('', 8))
+        self.connection_bar.addWidget(self.ingest_label)
         self.connection_bar.addWidget(self.status_indicator)
         
         self.layout.addLayout(self.connection_bar)
 
         # Visualization widget
         self.visualization = Visualization()
+        self.visualization.scheduler.frame_rendered.connect(self.on_frame_rendered)
         self.layout.addWidget(self.visualization)
 
         # Topic subscription controls - thu nhỏ
@@ -136,45 +213,34 @@ class MainApp(QtWidgets.QWidget):
         self.subscription_label.setFont(QtGui.QFont('', 8))
         self.layout.addWidget(self.subscription_label)
 
+        # Decode messages off the GUI thread; records are drained once per frame
+        self.ingest_worker = IngestWorker()
+        self.ingest_worker.start()
+        self.visualization.scheduler.add_frame_hook(self.drain_ingest)
+        
+        # Detected topics, shared by every client instance and the topic browser
+        self.topic_trie = TopicTrie()
+        self.topic_browser = None
+
         # Setup MQTT client
         # Load saved connection settings
         saved_settings = self.load_connection_settings()
     
         # Setup MQTT client with saved settings if available
         if saved_settings:
-            self.mqtt_client = MqttClient(
+            self.mqtt_client = self.new_mqtt_client(
                 saved_settings.get("broker", MQTT_BROKER),
                 saved_settings.get("port", MQTT_PORT)
             )
             
-            # Set credentials if provided
-            if saved_settings.get("username"):
-                self.mqtt_client.client.username_pw_set(
-                    saved_settings["username"],
-                    saved_settings["password"]
-                )
-            
-            # Configure SSL if enabled
-            if saved_settings.get("use_ssl", False):
-                self.mqtt_client.client.tls_set(
-                    ca_certs=saved_settings.get("ca_file") or None,
-                    certfile=saved_settings.get("cert_file") or None,
-                    keyfile=saved_settings.get("key_file") or None
-                )
+            # Credentials and SSL from the saved connection
+            self.mqtt_client.apply_settings(saved_settings)
             
             # Update status bar
             self.status_label.setText(f"MQTT: {saved_settings['broker']}:{saved_settings['port']}")
         else:
             # Use default settings
-            self.mqtt_client = MqttClient(MQTT_BROKER, MQTT_PORT)
-    
-        # Connect signals
-        self.mqtt_client.message_received.connect(self.on_message_received)
-        self.mqtt_client.connection_changed.connect(self.on_connection_changed)
-        self.mqtt_client.topic_detected.connect(self.on_topic_detected)
-        
-        # Detected topics
-        self.detected_topics = set()
+            self.mqtt_client = self.new_mqtt_client(MQTT_BROKER, MQTT_PORT)
         
         # Connect to broker
         self.mqtt_client.connect()
@@ -182,6 +248,16 @@ class MainApp(QtWidgets.QWidget):
         # Auto-subscribe to default topic
         QtCore.QTimer.singleShot(1000, lambda: self.auto_subscribe())
     
+    def new_mqtt_client(self, broker, port):
+        """Create a client wired to the shared ingest worker, topic trie, raw capture and signals"""
+        client = MqttClient(broker, port, ingest_worker=self.ingest_worker, topic_trie=self.topic_trie)
+        # A capture in progress continues across reconnects and settings changes
+        client.stream_recorder = self.stream_recorder
+        client.message_received.connect(self.on_message_received)
+        client.connection_changed.connect(self.on_connection_changed)
+        client.topic_detected.connect(self.on_topic_detected)
+        return client
+    
     def create_menu_bar(self):
         """Create menu bar at the top"""
         self.menu_bar = QtWidgets.QMenuBar()
@@ -189,6 +265,7 @@ class MainApp(QtWidgets.QWidget):
 
         # File menu
         self.menu_file = self.menu_bar.addMenu("File")
+        self.menu_file.addAction("Open Recording...", self.open_recording)
         self.menu_file.addAction("Export All Data", self.export_all_data)
         self.menu_file.addAction("Save Settings", self.save_settings)
         self.menu_file.addAction("Load Settings", self.load_settings)
@@ -208,6 +285,19 @@ class MainApp(QtWidgets.QWidget):
         connection_menu.addSeparator()
         connection_menu.addAction("Settings", self.show_connection_settings)
 
+        # Replay menu
+        replay_menu = self.menu_bar.addMenu("Replay")
+        self.record_stream_action = replay_menu.addAction("Record Raw Stream...", self.toggle_stream_recording)
+        replay_menu.addSeparator()
+        replay_menu.addAction("Replay Capture...", self.start_replay)
+        replay_menu.addAction("Pause/Resume Replay", self.toggle_replay_pause)
+        replay_menu.addAction("Seek Replay...", self.seek_replay)
+        replay_menu.addAction("Stop Replay", self.stop_replay)
+
+        # Tools menu
+        tools_menu = self.menu_bar.addMenu("Tools")
+        tools_menu.addAction("Pipeline Diagnostics...", self.show_diagnostics)
+
         # Help menu
         help_menu = self.menu_bar.addMenu("Help")
         help_menu.addAction("About", self.show_about_dialog)
@@ -220,9 +310,44 @@ class MainApp(QtWidgets.QWidget):
         # def show_connection_menu(self):
         # def show_help_menu(self):
     
+    def open_recording(self):
+        """Open a saved session file in a new graph"""
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Recording", RECORDING_DIR, "Session Files (*.rbcs);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        self.visualization.add_new_graph()
+        graph = self.visualization.graphs[-1]
+        try:
+            graph.open_recording(file_path)
+        except Exception as e:
+            graph.remove_graph()
+            QtWidgets.QMessageBox.critical(self, "Open Recording", f"Error opening recording: {str(e)}")
+    
     def export_all_data(self):
-        """Export all data to file"""
-        QtWidgets.QMessageBox.information(self, "Export", "This feature is not yet implemented.")
+        """Export the recordings of every graph on one timeline"""
+        graphs = [graph for graph in self.visualization.graphs
+                  if any(len(buffer) for buffer in graph.record_data.values())]
+        if not graphs:
+            QtWidgets.QMessageBox.information(self, "Export", "No recorded data to export.")
+            return
+        
+        # Recording times are relative to each graph's start; shift them onto the earliest start
+        first_start = min(graph.start_time for graph in graphs)
+        series = []
+        for graph in graphs:
+            series.extend(graph.export_series(prefix=f"Graph {graph.graph_id}/",
+                                              offset=graph.start_time - first_start))
+        export_series(self, series)
+    
+    def show_diagnostics(self):
+        """Show the per-stage latency panel (non-modal)"""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
     
     def save_settings(self):
         """Save application settings"""
@@ -256,30 +381,10 @@ class MainApp(QtWidgets.QWidget):
             self.mqtt_client.disconnect()  # Disconnect first
             
             # Update MQTT client
-            self.mqtt_client = MqttClient(
-                new_settings["broker"], 
-                new_settings["port"]
-            )
-            
-            # Set credentials if provided
-            if new_settings["username"]:
-                self.mqtt_client.client.username_pw_set(
-                    new_settings["username"],
-                    new_settings["password"]
-                )
-            
-            # Configure SSL if enabled
-            if new_settings["use_ssl"]:
-                self.mqtt_client.client.tls_set(
-                    ca_certs=new_settings["ca_file"] or None,
-                    certfile=new_settings["cert_file"] or None,
-                    keyfile=new_settings["key_file"] or None
-                )
+            self.mqtt_client = self.new_mqtt_client(new_settings["broker"], new_settings["port"])
             
-            # Reconnect signals
-            self.mqtt_client.message_received.connect(self.on_message_received)
-            self.mqtt_client.connection_changed.connect(self.on_connection_changed)
-            self.mqtt_client.topic_detected.connect(self.on_topic_detected)
+            # Set credentials and SSL if provided
+            self.mqtt_client.apply_settings(new_settings)
             
             # Update status bar
             self.status_label.setText(f"MQTT: {new_settings['broker']}:{new_settings['port']}")
@@ -290,6 +395,100 @@ class MainApp(QtWidgets.QWidget):
             # Save settings to config file
             self.save_connection_settings(new_settings)
     
+    def toggle_stream_recording(self):
+        """Start or stop capturing the raw MQTT stream to a file"""
+        if self.stream_recorder is not None:
+            self.mqtt_client.stream_recorder = None
+            self.stream_recorder.close()
+            QtWidgets.QMessageBox.information(
+                self, "Raw Stream",
+                f"Captured {self.stream_recorder.count} messages to {self.stream_recorder.path}")
+            self.stream_recorder = None
+            self.record_stream_action.setText("Record Raw Stream...")
+            return
+        
+        if self.replayer is not None:
+            # Replayed messages go through on_message and would end up in the capture
+            QtWidgets.QMessageBox.warning(self, "Raw Stream", "Stop the replay before recording the raw stream.")
+            return
+        
+        file_path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Record Raw Stream", RECORDING_DIR, "Stream Captures (*.rbcr);;All Files (*)"
+        )
+        if file_path:
+            try:
+                self.stream_recorder = StreamRecorder(file_path)
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Raw Stream", f"Error creating capture: {str(e)}")
+                return
+            self.mqtt_client.stream_recorder = self.stream_recorder
+            self.record_stream_action.setText("Stop Raw Stream Recording")
+    
+    def start_replay(self):
+        """Replay a raw stream capture through the live message path"""
+        if self.stream_recorder is not None:
+            # Replayed messages go through on_message and would end up in the capture
+            QtWidgets.QMessageBox.warning(self, "Replay", "Stop the raw stream recording before replaying.")
+            return
+        
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Replay Capture", RECORDING_DIR, "Stream Captures (*.rbcr);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        speeds = ["1x", "2x", "5x", "10x", "As fast as possible"]
+        speed_text, ok = QtWidgets.QInputDialog.getItem(self, "Replay Speed", "Speed:", speeds, 0, False)
+        if not ok:
+            return
+        speed = 0 if speed_text == speeds[-1] else float(speed_text[:-1])
+        
+        self.stop_replay()
+        try:
+            reader = StreamReader(file_path)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Replay", f"Error opening capture: {str(e)}")
+            return
+        
+        # Go through whatever client is current, exactly like messages from the broker
+        self.replayer = StreamReplayer(
+            reader,
+            lambda client, userdata, message: self.mqtt_client.on_message(client, userdata, message),
+            speed=speed,
+            on_finished=self.replay_finished.emit
+        )
+        self.replayer.start()
+    
+    def toggle_replay_pause(self):
+        if self.replayer is None:
+            return
+        if self.replayer.paused:
+            self.replayer.resume()
+        else:
+            self.replayer.pause()
+    
+    def seek_replay(self):
+        if self.replayer is None:
+            return
+        seconds, ok = QtWidgets.QInputDialog.getDouble(
+            self, "Seek Replay", "Position (s):", self.replayer.elapsed(),
+            0.0, self.replayer.reader.duration, 2)
+        if ok:
+            self.replayer.seek(seconds)
+    
+    def stop_replay(self):
+        if self.replayer is not None:
+            replayer = self.replayer
+            self.replayer = None
+            replayer.stop()
+            replayer.reader.close()
+    
+    def on_replay_finished(self):
+        if self.replayer is not None and not self.replayer.running:
+            print(f"Replay finished: {self.replayer.delivered} messages")
+            # Clears the status bar and closes the capture file
+            self.stop_replay()
+    
     def show_about_dialog(self):
         """Show about dialog"""
         QtWidgets.QMessageBox.about(self, "About", f"{APP_TITLE} v{APP_VERSION}\n\nDeveloped by AML Robocon Team")
@@ -312,13 +511,15 @@ class MainApp(QtWidgets.QWidget):
     
     def browse_topics(self):
         """Open dialog to browse and select topics"""
-        topics = list(self.detected_topics)
-        if not topics:
+        if not len(self.topic_trie):
             QtWidgets.QMessageBox.information(self, "No Topics", "No topics have been detected yet.")
             return
             
-        dialog = TopicBrowserDialog(self, topics)
-        if dialog.exec_() == QtWidgets.QDialog.Accepted:
+        dialog = TopicBrowserDialog(self, self.topic_trie)
+        self.topic_browser = dialog
+        accepted = dialog.exec_() == QtWidgets.QDialog.Accepted
+        self.topic_browser = None
+        if accepted:
             selected_topic = dialog.get_selected_topic()
             if selected_topic:
                 if self.mqtt_client.subscribe(selected_topic):
@@ -337,17 +538,41 @@ class MainApp(QtWidgets.QWidget):
                 topics_list.append(new_topic)
                 self.subscription_label.setText(f"Current subscriptions: {', '.join(topics_list)}")
 
-    def on_message_received(self, topic, payload):
+    def on_message_received(self, record):
         """Handle message received signal"""
         try:
             # Update the visualization
-            self.visualization.update(payload)
+            self.visualization.update(record)
         except Exception as e:
             print(f"Error processing message: {e}")
             
+    def drain_ingest(self):
+        """Hand the records decoded since the last frame to the visualization"""
+        self.ingest_worker.dispatch(self.handle_record)
+    
+    def handle_record(self, record):
+        self.mqtt_client.detect_topics(record)
+        self.on_message_received(record)
+    
+    def on_frame_rendered(self, stats):
+        """Show render frame time against the frame budget"""
+        self.frame_label.setText(
+            f"Frame: {stats['last_frame_ms']:.1f}/{stats['frame_budget_ms']:.0f} ms"
+            f" | Skipped: {stats['skipped_frames']}"
+        )
+        ingest = self.ingest_worker.get_stats()
+        text = f"Queue: {ingest['depth']}/{ingest['max_queue']} | Dropped: {ingest['dropped']}"
+        if self.replayer is not None:
+            text += f" | Replay: {self.replayer.elapsed():.1f}/{self.replayer.reader.duration:.1f} s"
+        if pipeline_latency.enabled:
+            latency = pipeline_latency.histograms[RECEIVE_TO_GUI]
+            text += f" | Latency p99: {latency.percentile(99) * 1000.0:.1f} ms"
+        self.ingest_label.setText(text)
+            
     def on_topic_detected(self, topic):
         """Handle new topic detected"""
-        self.detected_topics.add(topic)
+        if self.topic_browser is not None:
+            self.topic_browser.add_topic(topic)
 
     def on_connection_changed(self, connected):
         """Update connection status indicator"""
@@ -360,44 +585,23 @@ class MainApp(QtWidgets.QWidget):
 
     def closeEvent(self, event):
         """Clean up when closing the application"""
+        self.stop_replay()
+        if self.stream_recorder is not None:
+            self.stream_recorder.close()
         self.mqtt_client.disconnect()
+        # Write the pending samples and close the session files of disk recordings
+        for graph in self.visualization.graphs:
+            graph.close_disk_recording()
+        self.ingest_worker.stop()
         event.accept()
 
     def save_connection_settings(self, settings):
         """Save connection settings to file"""
-        try:
-            import json
-            import os
-            
-            # Create config directory if it doesn't exist
-            config_dir = os.path.join(os.path.expanduser("~"), ".mqtt_monitor")
-            os.makedirs(config_dir, exist_ok=True)
-            
-            # Save settings to file
-            with open(os.path.join(config_dir, "connections.json"), "w") as f:
-                json.dump(settings, f, indent=2)
-            
-            print(f"Settings saved to {os.path.join(config_dir, 'connections.json')}")
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        save_connection_settings(settings)
 
     def load_connection_settings(self):
         """Load connection settings from file"""
-        try:
-            import json
-            import os
-            
-            config_file = os.path.join(os.path.expanduser("~"), ".mqtt_monitor", "connections.json")
-            if not os.path.exists(config_file):
-                return None
-            
-            with open(config_file, "r") as f:
-                settings = json.load(f)
-            
-            return settings
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-            return None
+        return load_connection_settings()
 
     # Add a method to handle opening the connection dialog
     def open_connection_dialog(self):
@@ -456,17 +660,12 @@ class MainApp(QtWidgets.QWidget):
                 self.mqtt_client.disconnect()
             
             # Create new MQTT client
-            self.mqtt_client = MqttClient(broker, port)
+            self.mqtt_client = self.new_mqtt_client(broker, port)
             
             # Set credentials if provided
             if username:
                 self.mqtt_client.client.username_pw_set(username, password)
             
-            # Connect signals
-            self.mqtt_client.message_received.connect(self.on_message_received)
-            self.mqtt_client.connection_changed.connect(self.on_connection_changed)
-            self.mqtt_client.topic_detected.connect(self.on_topic_detected)
-            
             # Update status bar
             self.status_label.setText(f"MQTT: {broker}:{port}")
             
@@ -0,0 +1,298 @@
+"""
+Message decoding for MQTT Monitoring App
+Turns each raw MQTT payload into a MessageRecord exactly once
+"""
+
+import json
+import struct
+import time
+from config import DEVICE_TIMESTAMP_FIELD, DEVICE_TIMESTAMP_SCALE, DEVICE_CLOCK_RESYNC_S, PAYLOAD_DECODERS
+from payload_codecs import StructLayout, is_msgpack_map, msgpack_unpack
+from topic_trie import topic_matches
+
+# Wall-clock time of monotonic zero, so monotonic readings can be shown as dates
+MONOTONIC_EPOCH = time.time() - time.monotonic()
+
+
+def wall_time(monotonic_ns):
+    """Seconds since the epoch for a time.monotonic_ns() reading; never jumps with NTP"""
+    return MONOTONIC_EPOCH + monotonic_ns * 1e-9
+
+
+def wall_now():
+    """Current time on the same clock as record timestamps (use instead of time.time())"""
+    return MONOTONIC_EPOCH + time.monotonic_ns() * 1e-9
+
+
+class MessageRecord:
+    """A decoded MQTT message shared by every consumer"""
+
+    __slots__ = ("topic", "timestamp", "numeric", "text", "structured", "receive_ns", "device_time",
+                 "decoded_ns")
+
+    def __init__(self, topic, timestamp, numeric, text, structured=False, receive_ns=None, device_time=None):
+        self.topic = topic
+        self.timestamp = timestamp  # sample time (s since epoch): device time if known, else receive time
+        self.numeric = numeric      # key -> float
+        self.text = text            # key -> str, for values that are not numeric
+        self.structured = structured  # True if the payload was a JSON object
+        self.receive_ns = receive_ns  # time.monotonic_ns() on the network thread
+        self.device_time = device_time  # device timestamp from the payload (s, device clock) or None
+        self.decoded_ns = None  # time.monotonic_ns() after decoding, set only while latency stats are on
+
+    @property
+    def receive_time(self):
+        """Receive time in seconds since the epoch"""
+        if self.receive_ns is None:
+            return self.timestamp
+        return wall_time(self.receive_ns)
+
+    def keys(self):
+        """All field names, numeric first"""
+        return list(self.numeric) + list(self.text)
+
+    def __repr__(self):
+        return f"MessageRecord({self.topic!r}, numeric={self.numeric!r}, text={self.text!r})"
+
+
+def split_fields(data):
+    """Split a JSON object into numeric and non-numeric fields"""
+    numeric = {}
+    text = {}
+    for key, value in data.items():
+        try:
+            numeric[key] = float(value)
+        except (ValueError, TypeError):
+            text[key] = str(value)
+    return numeric, text
+
+
+def decode_records(topic, payload, timestamp=None, receive_ns=None, registry=None):
+    """Decode a raw payload (bytes or str) into MessageRecords with the decoder registered for its topic
+
+    Most payloads give one record; a batch of struct frames gives one per frame, oldest first.
+    """
+    if receive_ns is None:
+        receive_ns = time.monotonic_ns()
+    if timestamp is None:
+        timestamp = wall_time(receive_ns)
+    records = (registry or payload_decoders).decode(topic, payload, timestamp)
+    for record in records:
+        record.receive_ns = receive_ns
+        if DEVICE_TIMESTAMP_FIELD and DEVICE_TIMESTAMP_FIELD in record.numeric:
+            # The device's own sample time travels with the record, not as a plotted variable
+            record.device_time = record.numeric.pop(DEVICE_TIMESTAMP_FIELD) * DEVICE_TIMESTAMP_SCALE
+    return records
+
+
+def decode_payload(topic, payload, timestamp=None, receive_ns=None, registry=None):
+    """Decode a raw payload into one MessageRecord (the newest, for a batch of frames)"""
+    return decode_records(topic, payload, timestamp, receive_ns, registry)[-1]
+
+
+def decode_fields(topic, payload, timestamp):
+    """Split a raw payload into numeric and text fields"""
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode("utf-8", errors="replace")
+
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        # Not JSON: a bare number or a plain text message
+        try:
+            return MessageRecord(topic, timestamp, {"value": float(payload)}, {})
+        except ValueError:
+            return MessageRecord(topic, timestamp, {}, {"message": payload})
+
+    if isinstance(data, dict):
+        numeric, text = split_fields(data)
+        return MessageRecord(topic, timestamp, numeric, text, structured=True)
+
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return MessageRecord(topic, timestamp, {"value": float(data)}, {})
+
+    return MessageRecord(topic, timestamp, {}, {"message": payload})
+
+
+def decode_msgpack(topic, payload, timestamp):
+    """Decode a MessagePack payload; a map becomes named fields like a JSON object"""
+    data = msgpack_unpack(payload)
+    if isinstance(data, dict):
+        numeric, text = split_fields(data)
+        return MessageRecord(topic, timestamp, numeric, text, structured=True)
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return MessageRecord(topic, timestamp, {"value": float(data)}, {})
+    return MessageRecord(topic, timestamp, {}, {"message": str(data)})
+
+
+def decode_auto(topic, payload, timestamp):
+    """MessagePack maps are recognised by their first byte; everything else is JSON/number/text"""
+    if is_msgpack_map(payload):
+        try:
+            return decode_msgpack(topic, payload, timestamp)
+        except ValueError:
+            pass
+    return decode_fields(topic, payload, timestamp)
+
+
+class StructDecoder:
+    """Decode fixed-layout binary frames; fields are (name, struct code) or (name, struct code, scale)"""
+
+    def __init__(self, fields, byte_order="<"):
+        self.layout = StructLayout(fields, byte_order)
+        self.scales = {field[0]: field[2] for field in fields if len(field) > 2}
+
+    def __call__(self, topic, payload, timestamp):
+        """One MessageRecord per frame in the payload"""
+        scales = self.scales
+        records = []
+        for values in self.layout.unpack(payload):
+            numeric = {}
+            for name, value in values.items():
+                scale = scales.get(name)
+                numeric[name] = float(value) * scale if scale is not None else float(value)
+            records.append(MessageRecord(topic, timestamp, numeric, {}, structured=True))
+        return records
+
+
+FORMATS = ("struct", "msgpack", "json")
+
+
+def build_decoder(spec):
+    """Decoder for one PAYLOAD_DECODERS entry"""
+    fmt = spec.get("format", "json")
+    if fmt == "struct":
+        return StructDecoder(spec["fields"], spec.get("byte_order", "<"))
+    if fmt == "msgpack":
+        return decode_msgpack
+    if fmt == "json":
+        return decode_fields
+    raise ValueError(f"Unknown payload format: {fmt} (expected one of {', '.join(FORMATS)})")
+
+
+class DecoderRegistry:
+    """Payload decoders keyed by MQTT topic pattern
+
+    A decoder is called as decoder(topic, payload, timestamp) and returns a
+    MessageRecord or a list of them. The first registered pattern matching a topic wins; other
+    topics, and payloads a decoder rejects, go to the fallback.
+    """
+
+    def __init__(self, fallback=decode_auto):
+        self.fallback = fallback
+        self.entries = []  # (pattern, decoder) in priority order
+        self.cache = {}    # topic -> decoder
+        self.warned = set()  # topics whose decoder failed, reported once
+
+    def register(self, pattern, decoder):
+        self.entries.append((pattern, decoder))
+        self.cache.clear()
+
+    def unregister(self, pattern):
+        self.entries = [(p, d) for p, d in self.entries if p != pattern]
+        self.cache.clear()
+
+    def decoder_for(self, topic):
+        decoder = self.cache.get(topic)
+        if decoder is None:
+            decoder = self.fallback
+            for pattern, candidate in self.entries:
+                if topic_matches(pattern, topic):
+                    decoder = candidate
+                    break
+            self.cache[topic] = decoder
+        return decoder
+
+    def decode(self, topic, payload, timestamp):
+        """List of MessageRecords for one payload"""
+        decoder = self.decoder_for(topic)
+        try:
+            result = decoder(topic, payload, timestamp)
+        except (ValueError, struct.error) as e:
+            if decoder is self.fallback:
+                raise
+            if topic not in self.warned:
+                self.warned.add(topic)
+                print(f"Payload decoder for {topic} failed ({e}); decoding as JSON/text")
+            result = self.fallback(topic, payload, timestamp)
+        if isinstance(result, MessageRecord):
+            return [result]
+        return result
+
+
+def load_decoders(specs):
+    """DecoderRegistry for a list of PAYLOAD_DECODERS entries"""
+    registry = DecoderRegistry()
+    for spec in specs:
+        registry.register(spec["topic"], build_decoder(spec))
+    return registry
+
+
+# Shared by the ingest worker and the inline decoding path
+payload_decoders = load_decoders(PAYLOAD_DECODERS)
+
+
+class DeviceClock:
+    """Map device timestamps onto the receive timeline, one offset per topic
+
+    Epoch timestamps are used as they are. Timestamps from a free-running
+    clock (e.g. millis()) are anchored at the smallest observed
+    receive - device difference, i.e. the fastest delivery seen so far, and
+    re-anchored when the device restarts or drifts by DEVICE_CLOCK_RESYNC_S.
+    Re-anchoring can move the mapping backwards, so the timestamps of a topic
+    are clamped to never decrease: every buffer downstream assumes sorted time.
+    """
+
+    EPOCH_THRESHOLD = 1e9  # device times above this are seconds since the epoch
+
+    def __init__(self, resync=DEVICE_CLOCK_RESYNC_S):
+        self.resync = resync
+        self.offsets = {}  # topic -> receive time - device time (s)
+        self.last = {}     # topic -> last timestamp given out
+
+    def update_offset(self, record):
+        """Offset for the topic of a record with a free-running device time, re-anchored if needed"""
+        estimate = record.receive_time - record.device_time
+        offset = self.offsets.get(record.topic)
+        if offset is None or estimate < offset or estimate - offset > self.resync:
+            offset = self.offsets[record.topic] = estimate
+        return offset
+
+    def apply_all(self, records):
+        """apply() to the records of one payload, oldest first
+
+        The frames of a batch share one receive time, so the batch is anchored
+        on its newest frame; the older frames keep their device spacing.
+        """
+        newest = records[-1] if records else None
+        if (len(records) > 1 and newest.device_time is not None
+                and newest.device_time <= self.EPOCH_THRESHOLD):
+            self.update_offset(newest)
+        for record in records:
+            self.apply(record)
+        return records
+
+    def apply(self, record):
+        """Set record.timestamp to the sample time implied by its device timestamp"""
+        device_time = record.device_time
+        if device_time is None:
+            return record
+        topic = record.topic
+        if device_time > self.EPOCH_THRESHOLD:
+            timestamp = device_time
+        else:
+            timestamp = device_time + self.update_offset(record)
+        last = self.last.get(topic)
+        if last is not None and timestamp < last:
+            timestamp = last
+        record.timestamp = self.last[topic] = timestamp
+        return record
+
+
+def format_value(value):
+    """Format a field value for display"""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return repr(value)
+    return str(value)
@@ -0,0 +1,159 @@
+"""
+MQTT connection for MQTT Monitoring App
+Connection, subscription and decoding without Qt, shared by the GUI client
+and the headless recorder
+"""
+
+import paho.mqtt.client as mqtt
+import time
+from config import MQTT_USERNAME, MQTT_PASSWORD, MQTT_TOPIC
+from message_decoder import decode_records, wall_time, DeviceClock
+from topic_trie import TopicTrie
+
+
+class MqttConnection:
+    """paho client wrapper; subclasses override the notify_* hooks to publish events"""
+
+    def __init__(self, broker, port, message_callback=None, ingest_worker=None, topic_trie=None):
+        self.broker = broker
+        self.port = port
+        self.client = mqtt.Client()
+        self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
+        self.client.on_message = self.on_message
+        self.message_callback = message_callback
+        self.ingest_worker = ingest_worker  # decodes off the network thread when set
+        self.stream_recorder = None  # raw stream capture for replay
+        self.device_clock = DeviceClock()  # used when decoding inline
+        self.subscribed_topics = set()
+        # Detected topics; may be shared with the owner so they survive reconnects
+        self.topic_trie = topic_trie if topic_trie is not None else TopicTrie()
+
+        # Đặt thông tin xác thực từ config
+        self.client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
+
+    def apply_settings(self, settings):
+        """Apply the credentials and TLS options of a saved connection"""
+        if settings.get("username"):
+            self.client.username_pw_set(settings["username"], settings.get("password", ""))
+        if settings.get("use_ssl", False):
+            self.client.tls_set(
+                ca_certs=settings.get("ca_file") or None,
+                certfile=settings.get("cert_file") or None,
+                keyfile=settings.get("key_file") or None
+            )
+
+    def connect(self):
+        try:
+            self.client.connect(self.broker, self.port, 60)
+            self.client.loop_start()
+            return True
+        except Exception as e:
+            print(f"Connection failed: {e}")
+            return False
+
+    def disconnect(self):
+        self.client.loop_stop()
+        self.client.disconnect()
+
+    def is_connected(self):
+        return self.client.is_connected()
+
+    def subscribe(self, topic):
+        """Subscribe to the specified topic"""
+        try:
+            if not topic or topic.strip() == "":
+                print("Cannot subscribe to empty topic")
+                return False
+
+            if not self.is_connected():
+                print("Not connected to MQTT broker")
+                return False
+
+            result, _ = self.client.subscribe(topic)
+            if result == 0:  # MQTT_ERR_SUCCESS
+                print(f"Successfully subscribed to {topic}")
+                return True
+            else:
+                print(f"Failed to subscribe to {topic}")
+                return False
+        except Exception as e:
+            print(f"Exception subscribing to topic: {e}")
+            return False
+
+    def unsubscribe(self, topic):
+        if topic == "#":
+            # Don't allow unsubscribing from all topics
+            return False
+
+        result = self.client.unsubscribe(topic)
+        if result[0] == mqtt.MQTT_ERR_SUCCESS:
+            self.subscribed_topics.discard(topic)
+            return True
+        return False
+
+    def publish(self, topic, message):
+        self.client.publish(topic, message)
+
+    def on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            print("Connected to MQTT broker")
+            self.notify_connection(True)
+
+            # Resubscribe to all topics
+            for topic in self.subscribed_topics:
+                client.subscribe(topic)
+
+            # Subscribe to default topic if not already subscribed
+            if not self.subscribed_topics:
+                client.subscribe(MQTT_TOPIC)
+                self.subscribed_topics.add(MQTT_TOPIC)
+
+        else:
+            print(f"Failed to connect to MQTT broker with code: {rc}")
+            self.notify_connection(False)
+
+    def on_disconnect(self, client, userdata, rc):
+        print("Disconnected from MQTT broker")
+        self.notify_connection(False)
+
+    def on_message(self, client, userdata, message):
+        # Taken first, on the network thread: later queueing and rendering do not shift it
+        receive_ns = time.monotonic_ns()
+        if self.stream_recorder is not None:
+            self.stream_recorder.write(message.topic, message.payload, wall_time(receive_ns))
+
+        if self.ingest_worker is not None:
+            # Decoding and hand-off to the consumer happen in the ingest worker
+            self.ingest_worker.submit(message.topic, message.payload, receive_ns)
+        else:
+            # Decode once; every consumer shares the resulting record
+            records = decode_records(message.topic, message.payload, receive_ns=receive_ns)
+            for record in self.device_clock.apply_all(records):
+                self.detect_topics(record)
+                self.notify_record(record)
+
+        if self.message_callback:
+            self.message_callback(client, userdata, message)
+
+    def detect_topics(self, record):
+        """Count the record in the topic trie and announce new topics and JSON keys"""
+        keys = record.keys() if record.structured else None
+        for topic in self.topic_trie.add_message(record.topic, keys):
+            self.notify_topic(topic)
+
+    def get_detected_topics(self):
+        return self.topic_trie.entries()
+
+    def get_subscribed_topics(self):
+        return list(self.subscribed_topics)
+
+    # Event hooks, called from the network thread
+    def notify_connection(self, connected):
+        pass
+
+    def notify_record(self, record):
+        pass
+
+    def notify_topic(self, topic):
+        pass
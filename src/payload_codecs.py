@@ -0,0 +1,129 @@
+"""
+Binary payload codecs for MQTT Monitoring App
+Fixed-layout struct frames and MessagePack, unpacked to plain Python values
+"""
+
+import struct
+
+
+class StructLayout:
+    """A fixed-layout frame: fields is a list of (name, struct format code, ...) in wire order
+
+    A payload may hold several frames back to back (a batch of samples).
+    """
+
+    def __init__(self, fields, byte_order="<"):
+        # Pad bytes ("x", "2x") take no name
+        self.names = [field[0] for field in fields if not field[1].endswith("x")]
+        self.struct = struct.Struct(byte_order + "".join(field[1] for field in fields))
+        if len(self.names) != len(self.struct.unpack(bytes(self.struct.size))):
+            raise ValueError("Struct layout needs exactly one format code per field")
+
+    @property
+    def size(self):
+        return self.struct.size
+
+    def unpack(self, payload):
+        """[field name -> value], one dict per frame in payload order"""
+        size = self.struct.size
+        if not payload or len(payload) % size:
+            raise ValueError(f"Expected a multiple of {size} bytes, got {len(payload)}")
+        names = self.names
+        return [dict(zip(names, values)) for values in self.struct.iter_unpack(payload)]
+
+
+# MessagePack (https://msgpack.org) as written by e.g. ArduinoJson's serializeMsgPack:
+# fixed-width prefixes -> struct for the value that follows
+MSGPACK_FIXED = {
+    0xca: struct.Struct(">f"), 0xcb: struct.Struct(">d"),
+    0xcc: struct.Struct(">B"), 0xcd: struct.Struct(">H"), 0xce: struct.Struct(">I"), 0xcf: struct.Struct(">Q"),
+    0xd0: struct.Struct(">b"), 0xd1: struct.Struct(">h"), 0xd2: struct.Struct(">i"), 0xd3: struct.Struct(">q"),
+}
+# str/bin/array/map with an explicit length -> (kind, length struct)
+MSGPACK_SIZED = {
+    0xd9: ("str", struct.Struct(">B")), 0xda: ("str", struct.Struct(">H")), 0xdb: ("str", struct.Struct(">I")),
+    0xc4: ("bin", struct.Struct(">B")), 0xc5: ("bin", struct.Struct(">H")), 0xc6: ("bin", struct.Struct(">I")),
+    0xdc: ("array", struct.Struct(">H")), 0xdd: ("array", struct.Struct(">I")),
+    0xde: ("map", struct.Struct(">H")), 0xdf: ("map", struct.Struct(">I")),
+}
+
+
+def is_msgpack_map(payload):
+    """Whether payload starts like a MessagePack map; such a first byte is never valid UTF-8 text"""
+    return bool(payload) and isinstance(payload, (bytes, bytearray)) and (
+        0x80 <= payload[0] <= 0x8f or payload[0] in (0xde, 0xdf))
+
+
+def msgpack_unpack(payload):
+    """Unpack one MessagePack value (nil, bool, int, float, str, bin, array, map; no ext types)"""
+    try:
+        value, end = msgpack_value(payload, 0)
+    except (IndexError, struct.error):
+        raise ValueError("Truncated MessagePack payload")
+    if end != len(payload):
+        raise ValueError(f"{len(payload) - end} trailing bytes after MessagePack value")
+    return value
+
+
+def msgpack_value(data, pos):
+    """Return (value, position after it) for the value starting at pos"""
+    tag = data[pos]
+    pos += 1
+    if tag <= 0x7f:
+        return tag, pos
+    if tag >= 0xe0:
+        return tag - 0x100, pos
+    if tag <= 0x8f:
+        return msgpack_map(data, pos, tag & 0x0f)
+    if tag <= 0x9f:
+        return msgpack_array(data, pos, tag & 0x0f)
+    if tag <= 0xbf:
+        return msgpack_str(data, pos, tag & 0x1f)
+    if tag == 0xc0:
+        return None, pos
+    if tag == 0xc2:
+        return False, pos
+    if tag == 0xc3:
+        return True, pos
+    fixed = MSGPACK_FIXED.get(tag)
+    if fixed is not None:
+        return fixed.unpack_from(data, pos)[0], pos + fixed.size
+    sized = MSGPACK_SIZED.get(tag)
+    if sized is None:
+        raise ValueError(f"Unsupported MessagePack type 0x{tag:02x}")
+    kind, length = sized
+    count = length.unpack_from(data, pos)[0]
+    pos += length.size
+    if kind == "str":
+        return msgpack_str(data, pos, count)
+    if kind == "bin":
+        if pos + count > len(data):
+            raise ValueError("Truncated MessagePack binary")
+        return bytes(data[pos:pos + count]), pos + count
+    if kind == "array":
+        return msgpack_array(data, pos, count)
+    return msgpack_map(data, pos, count)
+
+
+def msgpack_str(data, pos, length):
+    end = pos + length
+    if end > len(data):
+        raise ValueError("Truncated MessagePack string")
+    return bytes(data[pos:end]).decode("utf-8", errors="replace"), end
+
+
+def msgpack_array(data, pos, count):
+    items = []
+    for _ in range(count):
+        item, pos = msgpack_value(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def msgpack_map(data, pos, count):
+    result = {}
+    for _ in range(count):
+        key, pos = msgpack_value(data, pos)
+        value, pos = msgpack_value(data, pos)
+        result[str(key)] = value
+    return result, pos
@@ -0,0 +1,144 @@
+"""
+Headless recorder for MQTT Monitoring App
+Logs every numeric field of every message to a session file at full rate,
+without Qt or matplotlib. Uses the saved connection settings unless
+overridden on the command line; stop with Ctrl+C.
+
+    python src/recorder.py --topic "robot/#" --output run1.rbcs
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+from config import MQTT_BROKER, MQTT_PORT, MQTT_TOPIC, RECORDING_DIR, INGEST_OVERLOAD_POLICY, INGEST_QUEUE_SIZE
+from connection_settings import load_connection_settings
+from mqtt_connection import MqttConnection
+from ingest_worker import IngestWorker
+from session_file import SessionWriter
+from message_decoder import wall_now
+
+DRAIN_INTERVAL_S = 0.05
+REPORT_INTERVAL_S = 1.0
+
+
+class Recorder:
+    """Drain decoded records from the ingest worker into a SessionWriter
+
+    Channels are named "<topic>/<key>"; times are seconds since the recorder
+    started, on the same clock as the GUI (device time when the payload has one).
+    """
+
+    def __init__(self, connection, ingest_worker, path):
+        self.connection = connection
+        self.ingest_worker = ingest_worker
+        self.path = path
+        self.writer = SessionWriter(path)
+        self.start_time = wall_now()
+        self.messages = 0
+        self.channels = set()
+
+    def drain(self):
+        start_time = self.start_time
+        writer = self.writer
+        records = self.ingest_worker.drain()
+        for record in records:
+            t = record.timestamp - start_time
+            for key, value in record.numeric.items():
+                name = f"{record.topic}/{key}"
+                if name not in self.channels:
+                    self.channels.add(name)
+                    print(f"New channel: {name}")
+                writer.append(name, t, value)
+        self.messages += len(records)
+        writer.flush_if_due()
+
+    def report(self, elapsed, messages, samples, dropped):
+        stats = self.ingest_worker.get_stats()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        print(f"{messages / elapsed:8.0f} msg/s | {samples / elapsed:9.0f} samples/s"
+              f" | channels {len(self.channels)} | queue {stats['depth']}/{stats['max_queue']}"
+              f" | dropped {stats['dropped']} (+{dropped}) | {size / 1e6:.1f} MB")
+
+    def run(self, duration=None):
+        """Record until Ctrl+C or for duration seconds; print a line of statistics per second"""
+        last_report = time.monotonic()
+        last_messages = last_samples = last_dropped = 0
+        end = last_report + duration if duration else None
+        try:
+            while end is None or time.monotonic() < end:
+                time.sleep(DRAIN_INTERVAL_S)
+                self.drain()
+                now = time.monotonic()
+                if now - last_report >= REPORT_INTERVAL_S:
+                    dropped = self.ingest_worker.get_stats()["dropped"]
+                    self.report(now - last_report, self.messages - last_messages,
+                                self.writer.samples - last_samples, dropped - last_dropped)
+                    last_report = now
+                    last_messages, last_samples, last_dropped = self.messages, self.writer.samples, dropped
+        except KeyboardInterrupt:
+            pass
+
+    def close(self):
+        self.connection.disconnect()
+        # Decode the tail still queued so it reaches the file
+        self.ingest_worker.stop(finish=True)
+        self.drain()
+        self.writer.close()
+        stats = self.ingest_worker.get_stats()
+        print(f"Recorded {self.messages} messages, {self.writer.samples} samples in {len(self.channels)} channels"
+              f" to {self.path} ({stats['dropped']} dropped)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Record MQTT telemetry to a session file without the GUI")
+    parser.add_argument("--broker", help="broker address (default: saved connection, then config)")
+    parser.add_argument("--port", type=int, help="broker port")
+    parser.add_argument("--username", help="broker username")
+    parser.add_argument("--password", help="broker password")
+    parser.add_argument("--topic", action="append", help="topic to subscribe to; may be repeated")
+    parser.add_argument("--output", help="session file (default: a timestamped file in the recordings folder)")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--policy", default=INGEST_OVERLOAD_POLICY,
+                        choices=["drop_oldest", "keep_latest", "block"], help="ingest queue overload policy")
+    parser.add_argument("--queue", type=int, default=INGEST_QUEUE_SIZE, help="ingest queue size")
+    parser.add_argument("--no-saved", action="store_true", help="ignore the saved connection settings")
+    return parser.parse_args(argv)
+
+
+def connection_settings(args):
+    """Saved settings overridden by the command line"""
+    settings = {} if args.no_saved else (load_connection_settings() or {})
+    settings.setdefault("broker", MQTT_BROKER)
+    settings.setdefault("port", MQTT_PORT)
+    for key in ("broker", "port", "username", "password"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    return settings
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = connection_settings(args)
+    topics = args.topic or [settings.get("default_topic") or MQTT_TOPIC]
+    path = args.output or os.path.join(RECORDING_DIR, f"headless_{datetime.now().strftime('%Y%m%d_%H%M%S')}.rbcs")
+
+    ingest_worker = IngestWorker(max_queue=args.queue, policy=args.policy)
+    connection = MqttConnection(settings["broker"], settings["port"], ingest_worker=ingest_worker)
+    connection.apply_settings(settings)
+    # Subscribed from on_connect, and again after every reconnect
+    connection.subscribed_topics.update(topics)
+
+    recorder = Recorder(connection, ingest_worker, path)
+    ingest_worker.start()
+    print(f"Recording {', '.join(topics)} from {settings['broker']}:{settings['port']} to {path}")
+    if not connection.connect():
+        recorder.close()
+        return 1
+    recorder.run(args.duration)
+    recorder.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
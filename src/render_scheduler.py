@@ -0,0 +1,140 @@
+"""
+Render scheduler for MQTT Monitoring App
+Coalesces repaint requests so every view is redrawn at most once per frame
+"""
+
+import time
+from PyQt5 import QtCore
+from config import REFRESH_RATE_MS
+from latency_stats import pipeline_latency, RENDER
+
+
+class RenderScheduler(QtCore.QObject):
+    """Drive all repaints from one timer running at REFRESH_RATE_MS"""
+
+    frame_rendered = QtCore.pyqtSignal(dict)  # frame statistics
+
+    def __init__(self, parent=None, interval_ms=REFRESH_RATE_MS):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.targets = {}       # target -> render callback
+        self.dirty = set()
+        self.frame_hooks = []   # callbacks run at the start of every frame
+
+        # Frame statistics
+        self.frame_count = 0
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+        self.over_budget_frames = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+        self.last_tick = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.render_frame)
+
+    @property
+    def frame_budget_ms(self):
+        return float(self.interval_ms)
+
+    def start(self):
+        """Start the frame timer"""
+        self.last_tick = None
+        self.timer.start(self.interval_ms)
+
+    def stop(self):
+        """Stop the frame timer"""
+        self.timer.stop()
+
+    def set_interval(self, interval_ms):
+        """Change the frame interval"""
+        self.interval_ms = max(1, int(interval_ms))
+        if self.timer.isActive():
+            self.timer.start(self.interval_ms)
+
+    def add_target(self, target, render_callback):
+        """Register a view that can be repainted by the scheduler"""
+        self.targets[target] = render_callback
+
+    def remove_target(self, target):
+        """Unregister a view"""
+        self.targets.pop(target, None)
+        self.dirty.discard(target)
+
+    def add_frame_hook(self, callback):
+        """Run callback at the start of every frame, before any repaint"""
+        if callback not in self.frame_hooks:
+            self.frame_hooks.append(callback)
+
+    def remove_frame_hook(self, callback):
+        if callback in self.frame_hooks:
+            self.frame_hooks.remove(callback)
+
+    def mark_dirty(self, target):
+        """Request a repaint of target on the next frame"""
+        if target in self.targets:
+            self.dirty.add(target)
+
+    def render_frame(self):
+        """Run frame hooks and repaint every dirty target once"""
+        now = time.perf_counter()
+
+        # Count frames the timer could not deliver because the GUI thread was busy
+        if self.last_tick is not None:
+            elapsed_ms = (now - self.last_tick) * 1000.0
+            missed = int(elapsed_ms / self.interval_ms) - 1
+            if missed > 0:
+                self.skipped_frames += missed
+        self.last_tick = now
+        self.frame_count += 1
+
+        for hook in list(self.frame_hooks):
+            try:
+                hook()
+            except Exception as e:
+                print(f"Error in frame hook: {e}")
+
+        if self.dirty:
+            render_start = time.perf_counter()
+            dirty = self.dirty
+            self.dirty = set()
+            for target in dirty:
+                render_callback = self.targets.get(target)
+                if render_callback is None:
+                    continue
+                try:
+                    render_callback()
+                except Exception as e:
+                    print(f"Error rendering {target}: {e}")
+            self.rendered_frames += 1
+            if pipeline_latency.enabled:
+                pipeline_latency.record(RENDER, time.perf_counter() - render_start)
+
+        self.last_frame_ms = (time.perf_counter() - now) * 1000.0
+        self.max_frame_ms = max(self.max_frame_ms, self.last_frame_ms)
+        if self.last_frame_ms > self.interval_ms:
+            self.over_budget_frames += 1
+
+        self.frame_rendered.emit(self.get_stats())
+
+    def get_stats(self):
+        """Return the current frame statistics"""
+        return {
+            "frame_budget_ms": self.frame_budget_ms,
+            "last_frame_ms": self.last_frame_ms,
+            "max_frame_ms": self.max_frame_ms,
+            "frames": self.frame_count,
+            "rendered_frames": self.rendered_frames,
+            "skipped_frames": self.skipped_frames,
+            "over_budget_frames": self.over_budget_frames,
+            "pending_targets": len(self.dirty),
+        }
+
+    def reset_stats(self):
+        self.frame_count = 0
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+        self.over_budget_frames = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
@@ -0,0 +1,241 @@
+"""
+Raw stream capture and replay for MQTT Monitoring App
+Records (receive time, topic, payload) exactly as paho delivered them and
+feeds them back through MqttClient.on_message without a broker
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import numpy as np
+
+MAGIC = b"RBCR"
+VERSION = 1
+
+# magic, version, padding -> 8 bytes
+FILE_HEADER = struct.Struct("<4sH2x")
+# receive time, topic length, payload length -> 14 bytes
+RECORD_HEADER = struct.Struct("<dHI")
+
+
+class StreamRecorder:
+    """Append raw MQTT messages to a capture file; safe to call from the network thread"""
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, topic, payload, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        topic_bytes = topic.encode("utf-8")
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(RECORD_HEADER.pack(timestamp, len(topic_bytes), len(payload)))
+            self.file.write(topic_bytes)
+            self.file.write(payload)
+            self.count += 1
+            now = time.monotonic()
+            if now - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.last_flush = now
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+class StreamReader:
+    """Random access to a capture file: an offset and timestamp per message"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.path.getsize(path)
+        if size < FILE_HEADER.size:
+            raise ValueError(f"{path} is not a stream capture")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a stream capture")
+        if version != VERSION:
+            raise ValueError(f"Unsupported stream capture version: {version}")
+
+        # Index every record once; a truncated last record (crash) is ignored
+        offsets = []
+        timestamps = []
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= size:
+            timestamp, topic_len, payload_len = RECORD_HEADER.unpack_from(self.map, offset)
+            end = offset + RECORD_HEADER.size + topic_len + payload_len
+            if end > size:
+                break
+            offsets.append(offset)
+            timestamps.append(timestamp)
+            offset = end
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def duration(self):
+        if not len(self.timestamps):
+            return 0.0
+        return float(self.timestamps[-1] - self.timestamps[0])
+
+    def record(self, i):
+        """Return (timestamp, topic, payload bytes) of message i"""
+        offset = int(self.offsets[i])
+        timestamp, topic_len, payload_len = RECORD_HEADER.unpack_from(self.map, offset)
+        start = offset + RECORD_HEADER.size
+        topic = self.map[start:start + topic_len].decode("utf-8")
+        payload = self.map[start + topic_len:start + topic_len + payload_len]
+        return timestamp, topic, payload
+
+    def index_at(self, seconds):
+        """Index of the first message at or after seconds from the start of the capture"""
+        if not len(self.timestamps):
+            return 0
+        return int(np.searchsorted(self.timestamps, self.timestamps[0] + seconds, side="left"))
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class ReplayMessage:
+    """Stand-in for paho's MQTTMessage"""
+
+    __slots__ = ("topic", "payload", "qos", "retain")
+
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+        self.qos = 0
+        self.retain = False
+
+
+class StreamReplayer:
+    """Feed a capture through an on_message(client, userdata, message) callback
+
+    speed is a multiple of real time; 0 replays as fast as possible.
+    Original inter-arrival times are kept relative to the replay clock, so
+    a late delivery does not shift the rest of the stream.
+    """
+
+    def __init__(self, reader, on_message, speed=1.0, on_finished=None):
+        self.reader = reader
+        self.on_message = on_message
+        self.on_finished = on_finished
+        self.speed = speed
+        self.position = 0
+        self.delivered = 0
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.running = False
+        self.paused = False
+        self.thread = None
+        self.reset_clock = True
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="StreamReplayer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def pause(self):
+        self.paused = True
+        self.wake.set()
+
+    def resume(self):
+        with self.lock:
+            self.paused = False
+            self.reset_clock = True
+        self.wake.set()
+
+    def seek(self, seconds):
+        """Continue from seconds after the start of the capture"""
+        with self.lock:
+            self.position = self.reader.index_at(max(0.0, seconds))
+            self.reset_clock = True
+        self.wake.set()
+
+    def set_speed(self, speed):
+        with self.lock:
+            self.speed = speed
+            self.reset_clock = True
+        self.wake.set()
+
+    def elapsed(self):
+        """Capture time (s) of the next message"""
+        if self.position >= len(self.reader) or not len(self.reader):
+            return self.reader.duration
+        return float(self.reader.timestamps[self.position] - self.reader.timestamps[0])
+
+    def run(self):
+        base_wall = base_capture = 0.0
+        while self.running:
+            if self.paused:
+                self.wake.wait(0.1)
+                self.wake.clear()
+                continue
+
+            with self.lock:
+                if self.position >= len(self.reader):
+                    break
+                i = self.position
+                speed = self.speed
+                timestamp = float(self.reader.timestamps[i])
+                if self.reset_clock:
+                    base_wall = time.monotonic()
+                    base_capture = timestamp
+                    self.reset_clock = False
+
+            if speed and speed > 0:
+                delay = base_wall + (timestamp - base_capture) / speed - time.monotonic()
+                if delay > 0:
+                    # Interruptible sleep: pause, seek, speed change and stop wake us early
+                    if self.wake.wait(delay):
+                        self.wake.clear()
+                        continue
+
+            with self.lock:
+                if self.position != i:
+                    continue  # seeked while waiting
+                self.position = i + 1
+
+            _, topic, payload = self.reader.record(i)
+            try:
+                self.on_message(None, None, ReplayMessage(topic, payload))
+            except Exception as e:
+                print(f"Error replaying message on {topic}: {e}")
+            self.delivered += 1
+
+        self.running = False
+        if self.on_finished:
+            self.on_finished()
@@ -0,0 +1,202 @@
+"""
+Time-series store for MQTT Monitoring App
+Preallocated NumPy ring buffers shared by the history and every live graph,
+and growable columns for recordings
+"""
+
+import numpy as np
+from config import MAX_DATA_POINTS, RECORDING_CHUNK_SIZE, RECORDING_VALUE_DTYPE
+from message_decoder import wall_now
+
+
+class RingBuffer:
+    """Fixed-capacity (time, value) buffer
+
+    Every sample is written twice, at i and i + capacity, so the newest n
+    samples are always one contiguous slice and can be returned as views.
+    Times never decrease: a sample older than the newest one (a key fed by
+    several topics) is stored at the newest time.
+    """
+
+    def __init__(self, capacity=MAX_DATA_POINTS):
+        self.capacity = max(1, int(capacity))
+        self.times = np.zeros(2 * self.capacity, dtype=np.float64)
+        self.values = np.zeros(2 * self.capacity, dtype=np.float64)
+        self.head = 0   # next write position in [0, capacity)
+        self.count = 0
+        self.last_time = -np.inf
+        self.version = 0  # bumped on every write
+
+    def __len__(self):
+        return self.count
+
+    def append(self, t, value):
+        if t < self.last_time:
+            t = self.last_time
+        self.last_time = t
+        i = self.head
+        j = i + self.capacity
+        self.times[i] = self.times[j] = t
+        self.values[i] = self.values[j] = value
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.version += 1
+
+    def view(self, n=None):
+        """Return (times, values) views of the newest n samples, oldest first"""
+        n = self.count if n is None else max(0, min(n, self.count))
+        end = self.head + self.capacity
+        return self.times[end - n:end], self.values[end - n:end]
+
+    def latest(self):
+        """Return the newest (time, value) or None"""
+        if not self.count:
+            return None
+        i = self.head - 1 + self.capacity
+        return self.times[i], self.values[i]
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.last_time = -np.inf
+        self.version += 1
+
+
+class SeriesStore:
+    """One RingBuffer per variable; times are stored in seconds since the store's epoch"""
+
+    EMPTY = np.zeros(0, dtype=np.float64)
+
+    def __init__(self, capacity=MAX_DATA_POINTS, epoch=None):
+        self.capacity = capacity
+        self.epoch = wall_now() if epoch is None else epoch
+        self.series = {}
+
+    def __contains__(self, key):
+        return key in self.series
+
+    def keys(self):
+        return list(self.series)
+
+    def get(self, key):
+        """Return the RingBuffer for key or None"""
+        return self.series.get(key)
+
+    def append(self, key, timestamp, value):
+        buffer = self.series.get(key)
+        if buffer is None:
+            buffer = self.series[key] = RingBuffer(self.capacity)
+        buffer.append(timestamp - self.epoch, value)
+
+    def append_many(self, numeric, timestamp):
+        """Append every field of a numeric dict sampled at the same timestamp"""
+        epoch_time = timestamp - self.epoch
+        series = self.series
+        for key, value in numeric.items():
+            buffer = series.get(key)
+            if buffer is None:
+                buffer = series[key] = RingBuffer(self.capacity)
+            buffer.append(epoch_time, value)
+
+    def window(self, key, n=None):
+        """Return (times, values) views of the newest n samples of key"""
+        buffer = self.series.get(key)
+        if buffer is None:
+            return self.EMPTY, self.EMPTY
+        return buffer.view(n)
+
+    def clear(self):
+        self.series = {}
+
+
+class RecordingBuffer:
+    """Append-only (time, value) columns for a recording
+
+    Columns grow in chunks of RECORDING_CHUNK_SIZE samples (geometrically for
+    long runs) so appends are amortized O(1) and the recorded data is always
+    one contiguous array that can be plotted without conversion.
+    """
+
+    EMPTY_TIMES = np.zeros(0, dtype=np.float64)
+
+    def __init__(self, chunk_size=RECORDING_CHUNK_SIZE, value_dtype=RECORDING_VALUE_DTYPE):
+        self.chunk_size = max(1, int(chunk_size))
+        self.times = np.empty(self.chunk_size, dtype=np.float64)
+        self.values = np.empty(self.chunk_size, dtype=value_dtype)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        """Reallocate so at least needed samples fit"""
+        capacity = len(self.times)
+        while capacity < needed:
+            # Whole chunks while small, then +50% so copies stay amortized
+            capacity += max(self.chunk_size, capacity // 2)
+        times = np.empty(capacity, dtype=self.times.dtype)
+        values = np.empty(capacity, dtype=self.values.dtype)
+        times[:self.count] = self.times[:self.count]
+        values[:self.count] = self.values[:self.count]
+        self.times = times
+        self.values = values
+
+    def append(self, t, value):
+        n = self.count
+        if n == len(self.times):
+            self.grow(n + 1)
+        self.times[n] = t
+        self.values[n] = value
+        self.count = n + 1
+
+    def extend(self, times, values):
+        n = self.count
+        m = len(times)
+        if n + m > len(self.times):
+            self.grow(n + m)
+        self.times[n:n + m] = times
+        self.values[n:n + m] = values
+        self.count = n + m
+
+    def view(self):
+        """Return (times, values) views of the recorded samples"""
+        return self.times[:self.count], self.values[:self.count]
+
+    def snapshot(self):
+        """A loader returning the samples recorded so far; later appends do not touch them"""
+        times, values = self.view()
+        return lambda: (times, values)
+
+    def tail(self, start):
+        """Return views of the samples from index start on"""
+        return self.times[start:self.count], self.values[start:self.count]
+
+    def view_window(self, t_start, t_end):
+        """Return views of the samples with t_start <= t <= t_end (times are in order)"""
+        times = self.times[:self.count]
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        return times[lo:hi], self.values[lo:hi]
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for both columns"""
+        return self.times.nbytes + self.values.nbytes
+
+    def truncate(self):
+        """Drop every sample but keep the allocated columns"""
+        self.count = 0
+
+    def clear(self):
+        self.times = np.empty(self.chunk_size, dtype=self.times.dtype)
+        self.values = np.empty(self.chunk_size, dtype=self.values.dtype)
+        self.count = 0
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
@@ -0,0 +1,642 @@
+"""
+Session files for MQTT Monitoring App
+Append-only chunked binary recordings with a per-chunk time index,
+read back through np.memmap
+
+A session is two files:
+  <name>.rbcs      file header, then NAME, DATA and LOD chunks in write order
+  <name>.rbcs.idx  one fixed-size entry per chunk (offset, count, time range,
+                   value range), so a session opens without scanning the data
+If the index is missing or behind (crash), the data file is scanned from the
+last indexed chunk; every DATA chunk header carries the same summary.
+
+Each DATA chunk is followed by a LOD chunk holding the min and max of every
+LOD_BLOCK samples, so a zoomed-out view reads a fraction of the file.
+"""
+
+import os
+import struct
+import time
+import numpy as np
+from config import RECORDING_CHUNK_SIZE, RECORDING_VALUE_DTYPE, RECORDING_FLUSH_INTERVAL_S
+from series_store import RecordingBuffer
+from decimation import blocks_minmax, LOD_BLOCK
+
+MAGIC = b"RBCS"
+INDEX_MAGIC = b"RBCI"
+VERSION = 3
+
+# magic, version, value itemsize, padding -> 16 bytes
+FILE_HEADER = struct.Struct("<4sHH8x")
+# tag, channel id, reserved, sample count (or name length), padding,
+# t_min, t_max, v_min, v_max -> 48 bytes
+CHUNK_HEADER = struct.Struct("<4sHHI4xdddd")
+
+TAG_NAME = b"NAME"  # declares a channel name
+TAG_DATA = b"DATA"  # float64 times followed by values, each column padded to 8 bytes
+TAG_LOD = b"LODS"   # min/max pairs of the DATA chunk before it, same layout
+
+KIND_NAME = 0
+KIND_DATA = 1
+KIND_LOD = 2
+
+# One entry per chunk; offset points at the chunk body (name bytes or times column)
+INDEX_DTYPE = np.dtype([
+    ("channel", "<u2"), ("kind", "<u2"), ("count", "<u4"), ("offset", "<u8"),
+    ("t_min", "<f8"), ("t_max", "<f8"), ("v_min", "<f8"), ("v_max", "<f8"),
+])
+INDEX_HEADER = struct.Struct("<4sHH8x")
+
+
+def padded(size):
+    """Round size up to a multiple of 8 so every column stays aligned"""
+    return (size + 7) & ~7
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+class SessionWriter:
+    """Append samples of many channels to one session file, one chunk at a time"""
+
+    def __init__(self, path, chunk_size=RECORDING_CHUNK_SIZE, value_dtype=RECORDING_VALUE_DTYPE):
+        self.path = path
+        self.chunk_size = max(1, int(chunk_size))
+        self.value_dtype = np.dtype(value_dtype)
+        self.channels = {}  # name -> channel id
+        self.pending = {}   # channel id -> RecordingBuffer not yet written
+        self.written = {}   # channel id -> samples already written
+        self.samples = 0
+        self.last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, self.value_dtype.itemsize))
+        self.index = open(index_path(path), "wb")
+        self.index.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION, INDEX_DTYPE.itemsize))
+        self.flush_files()
+
+    def write_entry(self, channel, kind, count, offset, t_min=0.0, t_max=0.0, v_min=0.0, v_max=0.0):
+        entry = np.array([(channel, kind, count, offset, t_min, t_max, v_min, v_max)], dtype=INDEX_DTYPE)
+        self.index.write(entry.tobytes())
+
+    def channel_id(self, name):
+        """Return the id of a channel, declaring it in the file on first use"""
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = len(self.channels)
+            self.channels[name] = channel
+            self.pending[channel] = RecordingBuffer(self.chunk_size, self.value_dtype)
+            encoded = name.encode("utf-8")
+            self.file.write(CHUNK_HEADER.pack(TAG_NAME, channel, 0, len(encoded), 0.0, 0.0, 0.0, 0.0))
+            body = self.file.tell()
+            self.file.write(encoded.ljust(padded(len(encoded)), b"\0"))
+            self.write_entry(channel, KIND_NAME, len(encoded), body)
+        return channel
+
+    def append(self, name, t, value):
+        channel = self.channel_id(name)
+        buffer = self.pending[channel]
+        buffer.append(t, value)
+        self.samples += 1
+        if len(buffer) >= self.chunk_size:
+            self.write_chunk(channel)
+            self.flush_files()
+
+    def write_chunk(self, channel):
+        """Write the pending samples of one channel as a DATA chunk and its LOD chunk, and index both"""
+        buffer = self.pending[channel]
+        count = len(buffer)
+        if not count:
+            return
+        times, values = buffer.view()
+        summary = (float(times.min()), float(times.max()), float(values.min()), float(values.max()))
+        self.write_columns(TAG_DATA, KIND_DATA, channel, times, values, summary)
+        self.write_columns(TAG_LOD, KIND_LOD, channel, *blocks_minmax(times, values, LOD_BLOCK), summary)
+        self.written[channel] = self.written.get(channel, 0) + count
+        buffer.truncate()
+
+    def write_columns(self, tag, kind, channel, times, values, summary):
+        self.file.write(CHUNK_HEADER.pack(tag, channel, 0, len(times), *summary))
+        body = self.file.tell()
+        self.file.write(times.tobytes())
+        values_bytes = values.tobytes()
+        self.file.write(values_bytes.ljust(padded(len(values_bytes)), b"\0"))
+        self.write_entry(channel, kind, len(times), body, *summary)
+
+    def flush_files(self):
+        # Data first: an index entry must never point past the end of the data file
+        self.file.flush()
+        self.index.flush()
+
+    def count(self, name):
+        """Samples of name written so far, on disk or pending"""
+        channel = self.channels.get(name)
+        if channel is None:
+            return 0
+        return self.written.get(channel, 0) + len(self.pending[channel])
+
+    def pending_view(self, name):
+        """Return (times, values) views of samples of name not yet on disk"""
+        channel = self.channels.get(name)
+        if channel is None:
+            return RecordingBuffer.EMPTY_TIMES, np.zeros(0, dtype=self.value_dtype)
+        return self.pending[channel].view()
+
+    def pending_bytes(self):
+        return sum(buffer.nbytes for buffer in self.pending.values())
+
+    def flush(self):
+        """Write every partial chunk and push it to the OS so it survives a crash"""
+        for channel in self.pending:
+            self.write_chunk(channel)
+        self.flush_files()
+        self.last_flush = time.monotonic()
+
+    def flush_if_due(self, interval=RECORDING_FLUSH_INTERVAL_S):
+        if time.monotonic() - self.last_flush >= interval:
+            self.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.index.close()
+
+
+class ChannelIndex:
+    """Chunk offsets and summaries of one channel, in write (and time) order"""
+
+    def __init__(self, name):
+        self.name = name
+        self.offsets = []
+        self.counts = []
+        self.summaries = []  # (t_min, t_max, v_min, v_max)
+        self.lod_offsets = []  # LOD chunk of each DATA chunk; the last one may be missing after a crash
+        self.lod_counts = []
+        self.total = 0
+        self.cached = None
+
+    def add(self, offset, count, summary):
+        self.offsets.append(offset)
+        self.counts.append(count)
+        self.summaries.append(summary)
+        self.total += count
+        self.cached = None
+
+    def add_lod(self, offset, count):
+        self.lod_offsets.append(offset)
+        self.lod_counts.append(count)
+
+    def arrays(self):
+        """Return (offsets, counts, summaries) as NumPy arrays"""
+        if self.cached is None:
+            summaries = np.array(self.summaries, dtype=np.float64).reshape(-1, 4)
+            self.cached = (np.array(self.offsets, dtype=np.int64),
+                           np.array(self.counts, dtype=np.int64),
+                           summaries)
+        return self.cached
+
+
+class SessionReader:
+    """Read a session file (possibly still being written) through a memory map
+
+    While the file grows, the map is only renewed once the file has doubled;
+    the part written since is read with plain file reads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = index_path(path)
+        self.channels = {}  # name -> channel id
+        self.names = {}     # channel id -> name
+        self.index = {}     # channel id -> ChannelIndex
+        self.value_dtype = None
+        self.map = None
+        self.file = None   # reads past the end of the map
+        self.size = 0      # file size at the last refresh
+        self.scanned = 0          # end of the last known chunk in the data file
+        self.index_entries = 0    # index entries already loaded
+        self.refresh()
+
+    def refresh(self):
+        """Pick up chunks appended since the last call"""
+        size = os.path.getsize(self.path)
+        if size < FILE_HEADER.size or size <= self.scanned:
+            return
+        self.size = size
+
+        if self.value_dtype is None:
+            magic, version, itemsize = FILE_HEADER.unpack_from(self.read_at(0, FILE_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a session file")
+            if version != VERSION:
+                raise ValueError(f"Unsupported session file version: {version}")
+            self.value_dtype = np.dtype(np.float32 if itemsize == 4 else np.float64)
+            self.scanned = FILE_HEADER.size
+
+        self.load_index(size)
+        self.scan(size)
+
+    def read_at(self, offset, nbytes):
+        """Bytes offset..offset + nbytes of the file: a view of the map where it covers them"""
+        end = offset + nbytes
+        if self.map is None or end > len(self.map):
+            if self.map is None or self.size >= 2 * len(self.map):
+                # Remapped O(log size) times while the file grows
+                self.map = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(self.size,))
+            else:
+                if self.file is None:
+                    self.file = open(self.path, "rb")
+                self.file.seek(offset)
+                return self.file.read(nbytes)
+        return self.map[offset:end]
+
+    def map_all(self):
+        """Map the whole file, once it no longer grows"""
+        if self.size and (self.map is None or len(self.map) < self.size):
+            self.map = np.memmap(self.path, dtype=np.uint8, mode="r", shape=(self.size,))
+
+    def chunk_end(self, kind, offset, count):
+        if kind == KIND_NAME:
+            return offset + padded(count)
+        return offset + count * 8 + padded(count * self.value_dtype.itemsize)
+
+    def add_chunk(self, channel, kind, count, offset, summary):
+        if kind == KIND_NAME:
+            name = bytes(self.read_at(offset, count)).decode("utf-8")
+            self.channels[name] = channel
+            self.names[channel] = name
+            self.index.setdefault(channel, ChannelIndex(name))
+        else:
+            if channel not in self.index:
+                self.index[channel] = ChannelIndex(self.names.get(channel, str(channel)))
+            if kind == KIND_LOD:
+                self.index[channel].add_lod(offset, count)
+            else:
+                self.index[channel].add(offset, count, summary)
+        self.scanned = self.chunk_end(kind, offset, count)
+
+    def load_index(self, size):
+        """Load index entries written since the last refresh (no data file access)"""
+        if not os.path.exists(self.index_path):
+            return
+        available = (os.path.getsize(self.index_path) - INDEX_HEADER.size) // INDEX_DTYPE.itemsize
+        if available <= self.index_entries:
+            return
+        if self.index_entries == 0:
+            with open(self.index_path, "rb") as f:
+                magic, version, itemsize = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC or version != VERSION or itemsize != INDEX_DTYPE.itemsize:
+                return
+        entries = np.fromfile(self.index_path, dtype=INDEX_DTYPE, count=available - self.index_entries,
+                              offset=INDEX_HEADER.size + self.index_entries * INDEX_DTYPE.itemsize)
+        for entry in entries.tolist():
+            channel, kind, count, offset, t_min, t_max, v_min, v_max = entry
+            if offset < self.scanned:
+                # Already found by scanning the data file
+                self.index_entries += 1
+                continue
+            if self.chunk_end(kind, offset, count) > size:
+                break
+            self.add_chunk(channel, kind, count, offset, (t_min, t_max, v_min, v_max))
+            self.index_entries += 1
+
+    def scan(self, size):
+        """Walk chunk headers the index does not cover yet (index behind after a crash)"""
+        offset = self.scanned
+        while offset + CHUNK_HEADER.size <= size:
+            header = self.read_at(offset, CHUNK_HEADER.size)
+            tag, channel, _, count, t_min, t_max, v_min, v_max = CHUNK_HEADER.unpack_from(header)
+            if tag == TAG_NAME:
+                kind = KIND_NAME
+            elif tag == TAG_DATA:
+                kind = KIND_DATA
+            elif tag == TAG_LOD:
+                kind = KIND_LOD
+            else:
+                break  # corrupt tail
+            body = offset + CHUNK_HEADER.size
+            end = self.chunk_end(kind, body, count)
+            if end > size:
+                break  # chunk still being written, or cut short by a crash
+            self.add_chunk(channel, kind, count, body, (t_min, t_max, v_min, v_max))
+            offset = end
+
+    def channel_index(self, name):
+        channel = self.channels.get(name)
+        return self.index.get(channel) if channel is not None else None
+
+    def count(self, name):
+        index = self.channel_index(name)
+        return index.total if index is not None else 0
+
+    def time_range(self, name):
+        """Return (t_min, t_max) of name from the index, or None"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return None
+        summaries = index.arrays()[2]
+        return float(summaries[:, 0].min()), float(summaries[:, 1].max())
+
+    def empty(self):
+        return RecordingBuffer.EMPTY_TIMES, np.zeros(0, dtype=self.value_dtype or np.float32)
+
+    def chunk_arrays(self, offset, count):
+        """Return zero-copy (times, values) views of one chunk"""
+        data = self.read_at(offset, count * 8 + count * self.value_dtype.itemsize)
+        times = np.frombuffer(data, dtype=np.float64, count=count)
+        values = np.frombuffer(data, dtype=self.value_dtype, count=count, offset=count * 8)
+        return times, values
+
+    def read_chunks(self, index, first, last):
+        """Return (times, values) of chunks first..last (inclusive) of a channel"""
+        offsets, counts, _ = index.arrays()
+        if first == last:
+            return self.chunk_arrays(int(offsets[first]), int(counts[first]))
+        parts = [self.chunk_arrays(int(offsets[i]), int(counts[i])) for i in range(first, last + 1)]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def chunk_range(self, index, t_start, t_end):
+        """(first, last) chunks of a channel that overlap [t_start, t_end]; first > last if none"""
+        summaries = index.arrays()[2]
+        # Chunks are in time order: binary search the per-chunk time index
+        first = int(np.searchsorted(summaries[:, 1], t_start, side="left"))
+        last = int(np.searchsorted(summaries[:, 0], t_end, side="right")) - 1
+        return first, last
+
+    def window_size(self, name, t_start, t_end):
+        """(samples, chunks) of name overlapping [t_start, t_end], from the index alone"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return 0, 0
+        first, last = self.chunk_range(index, t_start, t_end)
+        if first > last:
+            return 0, 0
+        return int(index.arrays()[1][first:last + 1].sum()), last - first + 1
+
+    def summary_window(self, name, t_start, t_end):
+        """(t_min, v_min), (t_max, v_max) of every chunk of name overlapping [t_start, t_end], from the index alone"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return self.empty()
+        first, last = self.chunk_range(index, t_start, t_end)
+        if first > last:
+            return self.empty()
+        rows = index.arrays()[2][first:last + 1]
+        times = rows[:, 0:2].ravel()
+        values = rows[:, 2:4].ravel().astype(self.value_dtype)
+        return times, values
+
+    def read_lod_window(self, name, t_start, t_end):
+        """Like read_window, from the LOD chunks (DATA where a LOD chunk is missing)"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return self.empty()
+        first, last = self.chunk_range(index, t_start, t_end)
+        if first > last:
+            return self.empty()
+        offsets, counts, _ = index.arrays()
+        parts = []
+        for i in range(first, last + 1):
+            if i < len(index.lod_offsets):
+                parts.append(self.chunk_arrays(index.lod_offsets[i], index.lod_counts[i]))
+            else:
+                parts.append(self.chunk_arrays(int(offsets[i]), int(counts[i])))
+        times = np.concatenate([p[0] for p in parts])
+        values = np.concatenate([p[1] for p in parts])
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        return times[lo:hi], values[lo:hi]
+
+    def read(self, name):
+        """Return (times, values) of every sample of name on disk"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return self.empty()
+        return self.read_chunks(index, 0, len(index.offsets) - 1)
+
+    def read_from(self, name, start):
+        """Return (times, values) of name from sample index start on, touching only the chunks involved"""
+        index = self.channel_index(name)
+        if index is None or start >= index.total:
+            return self.empty()
+        counts = index.arrays()[1]
+        ends = np.cumsum(counts)
+        first = int(np.searchsorted(ends, start, side="right"))
+        times, values = self.read_chunks(index, first, len(counts) - 1)
+        skip = start - (int(ends[first - 1]) if first else 0)
+        return times[skip:], values[skip:]
+
+    def read_window(self, name, t_start, t_end):
+        """Return (times, values) of name with t_start <= t <= t_end, touching only the chunks involved"""
+        index = self.channel_index(name)
+        if index is None or not index.total:
+            return self.empty()
+        first, last = self.chunk_range(index, t_start, t_end)
+        if first > last:
+            return self.empty()
+        times, values = self.read_chunks(index, first, last)
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        return times[lo:hi], values[lo:hi]
+
+    def close(self):
+        self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class DiskRecording:
+    """Recording backend that streams samples to a session file, or a saved session opened read-only"""
+
+    def __init__(self, path, writable=True):
+        self.path = path
+        self.writer = SessionWriter(path) if writable else None
+        self.reader = SessionReader(path)
+
+    @classmethod
+    def open(cls, path):
+        """A saved session file, read-only; raises ValueError if path is not one"""
+        return cls(path, writable=False)
+
+    def names(self):
+        """Channel names in the order they were first written"""
+        self.reader.refresh()
+        return [self.reader.names[channel] for channel in sorted(self.reader.names)]
+
+    def pending_view(self, name):
+        """Samples of name not on disk yet (none for a saved session)"""
+        if self.writer is None:
+            return self.reader.empty()
+        return self.writer.pending_view(name)
+
+    def pending_bytes(self, name):
+        channel = self.writer.channels.get(name) if self.writer is not None else None
+        if channel is None:
+            return 0
+        return self.writer.pending[channel].nbytes
+
+    def channel(self, name):
+        return DiskChannel(self, name)
+
+    def append(self, name, t, value):
+        self.writer.append(name, t, value)
+
+    def view(self, name):
+        """Samples on disk followed by samples still pending in memory"""
+        self.reader.refresh()
+        disk_times, disk_values = self.reader.read(name)
+        tail_times, tail_values = self.pending_view(name)
+        if not len(tail_times):
+            return disk_times, disk_values
+        if not len(disk_times):
+            return tail_times, tail_values
+        return np.concatenate((disk_times, tail_times)), np.concatenate((disk_values, tail_values))
+
+    def view_window(self, name, t_start, t_end):
+        """Samples of name with t_start <= t <= t_end, loading only the chunks involved"""
+        self.reader.refresh()
+        return self.with_pending(name, t_start, t_end, *self.reader.read_window(name, t_start, t_end))
+
+    def lod_window(self, name, t_start, t_end):
+        """view_window from the LOD chunks: LOD_BLOCK times fewer points, then the raw pending tail"""
+        self.reader.refresh()
+        return self.with_pending(name, t_start, t_end, *self.reader.read_lod_window(name, t_start, t_end))
+
+    def summary_window(self, name, t_start, t_end):
+        """view_window from the index: one min/max pair per chunk, then the raw pending tail"""
+        self.reader.refresh()
+        return self.with_pending(name, t_start, t_end, *self.reader.summary_window(name, t_start, t_end))
+
+    def with_pending(self, name, t_start, t_end, disk_times, disk_values):
+        """Append the pending samples of name within [t_start, t_end] to what was read from disk"""
+        tail_times, tail_values = self.pending_view(name)
+        lo = int(np.searchsorted(tail_times, t_start, side="left"))
+        hi = int(np.searchsorted(tail_times, t_end, side="right"))
+        if lo >= hi:
+            return disk_times, disk_values
+        if not len(disk_times):
+            return tail_times[lo:hi], tail_values[lo:hi]
+        return (np.concatenate((disk_times, tail_times[lo:hi])),
+                np.concatenate((disk_values, tail_values[lo:hi])))
+
+    def window_size(self, name, t_start, t_end):
+        """(samples, chunks on disk) of name within [t_start, t_end], without reading samples"""
+        self.reader.refresh()
+        samples, chunks = self.reader.window_size(name, t_start, t_end)
+        tail_times = self.pending_view(name)[0]
+        samples += int(np.searchsorted(tail_times, t_end, side="right") -
+                       np.searchsorted(tail_times, t_start, side="left"))
+        return samples, chunks
+
+    def time_range(self, name):
+        """(t_min, t_max) of name from the index and the pending tail, or None"""
+        self.reader.refresh()
+        span = self.reader.time_range(name)
+        tail_times = self.pending_view(name)[0]
+        if not len(tail_times):
+            return span
+        if span is None:
+            return float(tail_times[0]), float(tail_times[-1])
+        return span[0], float(tail_times[-1])
+
+    def tail(self, name, start):
+        """Samples of name from index start on (disk chunks first, then the pending tail)"""
+        self.reader.refresh()
+        on_disk = self.reader.count(name)
+        tail_times, tail_values = self.pending_view(name)
+        if start >= on_disk:
+            start -= on_disk
+            return tail_times[start:], tail_values[start:]
+        disk_times, disk_values = self.reader.read_from(name, start)
+        if not len(tail_times):
+            return disk_times, disk_values
+        return np.concatenate((disk_times, tail_times)), np.concatenate((disk_values, tail_values))
+
+    def count(self, name):
+        if self.writer is None:
+            self.reader.refresh()
+            return self.reader.count(name)
+        # Known to the writer; no need to touch the file
+        return self.writer.count(name)
+
+    def snapshot(self, name):
+        """A loader reading the samples of name recorded so far through its own reader, for another thread"""
+        if self.writer is not None and not self.writer.file.closed:
+            self.writer.flush()
+        path, count = self.path, self.count(name)
+
+        def load():
+            reader = SessionReader(path)
+            times, values = reader.read(name)
+            return times[:count], values[:count]
+        return load
+
+    def memory_bytes(self):
+        return self.writer.pending_bytes() if self.writer is not None else 0
+
+    def disk_bytes(self):
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def flush_if_due(self):
+        """Called periodically by the owner, so pending samples reach disk whether or not more arrive"""
+        if self.writer is not None:
+            self.writer.flush_if_due()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader.refresh()
+        self.reader.map_all()
+
+
+class DiskChannel:
+    """record_data entry for one variable of a DiskRecording"""
+
+    def __init__(self, recording, name):
+        self.recording = recording
+        self.name = name
+
+    def __len__(self):
+        return self.recording.count(self.name)
+
+    def append(self, t, value):
+        self.recording.append(self.name, t, value)
+
+    def view(self):
+        return self.recording.view(self.name)
+
+    def tail(self, start):
+        return self.recording.tail(self.name, start)
+
+    def view_window(self, t_start, t_end):
+        return self.recording.view_window(self.name, t_start, t_end)
+
+    def snapshot(self):
+        return self.recording.snapshot(self.name)
+
+    def lod_window(self, t_start, t_end):
+        return self.recording.lod_window(self.name, t_start, t_end)
+
+    def summary_window(self, t_start, t_end):
+        return self.recording.summary_window(self.name, t_start, t_end)
+
+    def window_size(self, t_start, t_end):
+        return self.recording.window_size(self.name, t_start, t_end)
+
+    def time_range(self):
+        return self.recording.time_range(self.name)
+
+    @property
+    def nbytes(self):
+        """Samples are on disk; only the pending tail of the channel is in memory"""
+        return self.recording.pending_bytes(self.name)
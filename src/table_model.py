@@ -0,0 +1,278 @@
+"""
+Item models for MQTT Monitoring App
+Latest value per (topic, key), stored in flat lists and published once per frame,
+an incremental filter proxy over models with precomputed search keys, and a
+lazily expanded tree over the topic trie
+"""
+
+from PyQt5 import QtCore
+from message_decoder import format_value
+
+
+class TelemetryTableModel(QtCore.QAbstractTableModel):
+    """Topic / Variable / Value rows backed by flat lists"""
+
+    HEADERS = ["Topic", "Variable", "Value"]
+    VALUE_COLUMN = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.topics = []
+        self.keys = []
+        self.values = []  # raw values; formatted only when a visible cell is painted
+        self.rows = {}    # (topic, key) -> row
+        self.search_keys = []  # lowercase "topic\nkey", built once per row
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.values)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if column == 0:
+            return self.topics[row]
+        if column == 1:
+            return self.keys[row]
+        return format_value(self.values[row])
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def search_key(self, row):
+        return self.search_keys[row]
+
+    def apply_updates(self, updates):
+        """Apply {(topic, key): value} in one batch; return the range of rows added"""
+        values = self.values
+        rows = self.rows
+        changed_min = changed_max = None
+        new_cells = []
+        for cell, value in updates.items():
+            row = rows.get(cell)
+            if row is None:
+                new_cells.append((cell, value))
+                continue
+            values[row] = value
+            if changed_min is None or row < changed_min:
+                changed_min = row
+            if changed_max is None or row > changed_max:
+                changed_max = row
+
+        # One dataChanged for the whole frame; the view repaints only the visible part of it
+        if changed_min is not None:
+            self.dataChanged.emit(self.index(changed_min, self.VALUE_COLUMN),
+                                  self.index(changed_max, self.VALUE_COLUMN),
+                                  [QtCore.Qt.DisplayRole])
+
+        first = len(values)
+        if new_cells:
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_cells) - 1)
+            for (topic, key), value in new_cells:
+                rows[(topic, key)] = len(values)
+                self.topics.append(topic)
+                self.keys.append(key)
+                self.search_keys.append(f"{topic}\n{key}".lower())
+                values.append(value)
+            self.endInsertRows()
+        return first, len(values)
+
+    def clear(self):
+        self.beginResetModel()
+        self.topics = []
+        self.keys = []
+        self.values = []
+        self.rows = {}
+        self.search_keys = []
+        self.endResetModel()
+
+
+class SearchableListModel(QtCore.QAbstractListModel):
+    """Append-only list of strings with cached lowercase search keys"""
+
+    def __init__(self, items=None, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self.search_keys = []
+        if items:
+            self.add_items(items)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and index.isValid():
+            return self.items[index.row()]
+        return None
+
+    def add_items(self, items):
+        items = list(items)
+        if not items:
+            return
+        first = len(self.items)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(items) - 1)
+        self.items.extend(items)
+        self.search_keys.extend(item.lower() for item in items)
+        self.endInsertRows()
+
+    def search_key(self, row):
+        return self.search_keys[row]
+
+
+class IncrementalFilterProxy(QtCore.QSortFilterProxyModel):
+    """Substring filter over a source model that provides search_key(row)
+
+    Narrowing the query (the new text contains the old one) only re-checks
+    rows that currently match. Rows added later are matched once, when the
+    proxy first sees them.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self.matches = None  # matching source rows, None when there is no query
+        self.checked = 0     # source rows already tested against the query
+        # Value updates must not trigger re-filtering
+        self.setDynamicSortFilter(False)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self.recompute)
+
+    def set_query(self, text):
+        query = text.lower()
+        if query == self.query:
+            return
+        source = self.sourceModel()
+        if not query:
+            self.matches = None
+        elif self.matches is not None and self.query in query:
+            # Narrowing: only rows matching the previous query can match
+            self.matches = {row for row in self.matches if query in source.search_key(row)}
+        else:
+            self.matches = {row for row in range(source.rowCount())
+                            if query in source.search_key(row)}
+        self.query = query
+        self.checked = source.rowCount()
+        self.invalidateFilter()
+
+    def recompute(self):
+        query = self.query
+        self.query = ""
+        self.matches = None
+        self.checked = 0
+        self.set_query(query)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        if source_row >= self.checked:
+            # Rows added since the last query change are tested once, in order
+            source = self.sourceModel()
+            query = self.query
+            for row in range(self.checked, source_row + 1):
+                if query in source.search_key(row):
+                    self.matches.add(row)
+            self.checked = source_row + 1
+        return source_row in self.matches
+
+
+class TopicTreeModel(QtCore.QAbstractItemModel):
+    """Topic / Messages tree over a TopicTrie; children are exposed only when expanded"""
+
+    HEADERS = ["Topic", "Messages"]
+    FETCH_BATCH = 256  # rows exposed per fetchMore on very wide levels
+
+    def __init__(self, trie, parent=None):
+        super().__init__(parent)
+        self.trie = trie
+        self.fetched = {}  # node -> number of children exposed to views
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.trie.root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        node = self.node(parent)
+        if row < 0 or row >= self.fetched.get(node, 0) or column >= len(self.HEADERS):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, node.child_list[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.trie.root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.fetched.get(self.node(parent), 0)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return False
+        return bool(self.node(parent).child_list)
+
+    def canFetchMore(self, parent):
+        if parent.column() > 0:
+            return False
+        node = self.node(parent)
+        return len(node.child_list) > self.fetched.get(node, 0)
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        first = self.fetched.get(node, 0)
+        last = min(len(node.child_list), first + self.FETCH_BATCH) - 1
+        if last < first:
+            return
+        self.beginInsertRows(parent, first, last)
+        self.fetched[node] = last + 1
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == QtCore.Qt.DisplayRole:
+            if index.column() == 0:
+                return node.name
+            return str(node.total) if node.total else ""
+        if role == QtCore.Qt.ToolTipRole:
+            return node.path()
+        if role == QtCore.Qt.TextAlignmentRole and index.column() == 1:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def topic_added(self, topic):
+        """Expose new children along topic's path on levels a view has already expanded"""
+        node = self.trie.root
+        parent = QtCore.QModelIndex()
+        for name in topic.split("/"):
+            exposed = self.fetched.get(node)
+            if exposed is None:
+                return
+            if exposed < len(node.child_list) <= exposed + self.FETCH_BATCH:
+                # Larger backlogs are left to fetchMore as the view scrolls
+                self.beginInsertRows(parent, exposed, len(node.child_list) - 1)
+                self.fetched[node] = len(node.child_list)
+                self.endInsertRows()
+            node = node.children.get(name)
+            if node is None or node.row >= self.fetched[node.parent]:
+                return
+            parent = self.createIndex(node.row, 0, node)
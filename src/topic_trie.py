@@ -0,0 +1,170 @@
+"""
+Topic trie for MQTT Monitoring App
+Detected topics stored level by level with message counts and MQTT wildcard matching
+"""
+
+
+class TopicNode:
+    """One topic level; children keep their arrival order so views can index them by row"""
+
+    __slots__ = ("name", "parent", "children", "child_list", "row",
+                 "count", "total", "is_topic", "is_field", "fields")
+
+    def __init__(self, name="", parent=None, row=0):
+        self.name = name
+        self.parent = parent
+        self.children = {}      # name -> TopicNode
+        self.child_list = []    # children in arrival order
+        self.row = row          # position in parent.child_list
+        self.count = 0          # messages published on exactly this topic
+        self.total = 0          # messages published on this topic and below
+        self.is_topic = False   # a message arrived on this exact topic
+        self.is_field = False   # synthetic topic/key entry for a JSON key
+        self.fields = None      # JSON keys seen on this topic
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = TopicNode(name, self, len(self.child_list))
+            self.children[name] = node
+            self.child_list.append(node)
+        return node
+
+    def path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+
+class TopicTrie:
+    """Every detected topic, split on '/'
+
+    nodes maps full topic strings to their nodes, so counting a message on a
+    known topic is one dict lookup plus a walk up its levels.
+    """
+
+    def __init__(self):
+        self.root = TopicNode()
+        self.nodes = {}   # topic -> TopicNode (topics and JSON key entries)
+        self.topic_count = 0
+
+    def __len__(self):
+        return self.topic_count
+
+    def __contains__(self, topic):
+        node = self.nodes.get(topic)
+        return node is not None and node.is_topic
+
+    def find(self, topic):
+        return self.nodes.get(topic)
+
+    def node_for(self, topic):
+        node = self.nodes.get(topic)
+        if node is None:
+            node = self.root
+            for name in topic.split("/"):
+                node = node.child(name)
+            self.nodes[topic] = node
+        return node
+
+    def add_message(self, topic, keys=None):
+        """Count one message on topic; return the topic entries that are new (topic, topic/key)"""
+        node = self.node_for(topic)
+        added = []
+        if not node.is_topic:
+            node.is_topic = True
+            node.is_field = False
+            self.topic_count += 1
+            added.append(topic)
+        node.count += 1
+        level = node
+        while level is not None:
+            level.total += 1
+            level = level.parent
+
+        if keys:
+            fields = node.fields
+            if fields is None:
+                fields = node.fields = set()
+            if not fields.issuperset(keys):
+                for key in keys:
+                    if key not in fields:
+                        fields.add(key)
+                        subtopic = f"{topic}/{key}"
+                        field = self.node_for(subtopic)
+                        if not field.is_topic:
+                            field.is_field = True
+                        added.append(subtopic)
+        return added
+
+    def topics(self):
+        """Every topic a message arrived on, in arrival order"""
+        return [topic for topic, node in self.nodes.items() if node.is_topic]
+
+    def entries(self):
+        """Topics plus their JSON key entries"""
+        return list(self.nodes)
+
+    def match(self, pattern, limit=None):
+        """Topics matching an MQTT subscription pattern (+ one level, # any remaining levels)"""
+        levels = pattern.split("/")
+        results = []
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == len(levels):
+                if node.is_topic:
+                    results.append(node.path())
+                continue
+            level = levels[depth]
+            if level == "#":
+                # '#' also matches the parent level itself
+                if node.is_topic and node is not self.root:
+                    results.append(node.path())
+                descendants = [child for child in node.child_list
+                               if depth or not child.name.startswith("$")]
+                while descendants:
+                    child = descendants.pop()
+                    if child.is_topic:
+                        results.append(child.path())
+                    descendants.extend(child.child_list)
+            elif level == "+":
+                for child in reversed(node.child_list):
+                    # Wildcards never match a leading $ level ($SYS/...)
+                    if depth or not child.name.startswith("$"):
+                        stack.append((child, depth + 1))
+            else:
+                child = node.children.get(level)
+                if child is not None:
+                    stack.append((child, depth + 1))
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
+
+    def clear(self):
+        self.root = TopicNode()
+        self.nodes = {}
+        self.topic_count = 0
+
+
+def is_pattern(topic):
+    return "+" in topic or "#" in topic
+
+
+def topic_matches(pattern, topic):
+    """Whether one topic matches an MQTT subscription pattern, with the same rules as TopicTrie.match"""
+    levels = pattern.split("/")
+    names = topic.split("/")
+    if names[0].startswith("$") and levels[0] in ("+", "#"):
+        return False
+    for depth, level in enumerate(levels):
+        if level == "#":
+            return True
+        if depth >= len(names):
+            return False
+        if level != "+" and level != names[depth]:
+            return False
+    return len(levels) == len(names)
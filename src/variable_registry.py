@@ -0,0 +1,39 @@
+"""
+Variable registry for MQTT Monitoring App
+Tracks every numeric variable seen so far and announces each one only once
+"""
+
+from PyQt5 import QtCore
+
+
+class VariableRegistry(QtCore.QObject):
+    """Known variable names plus one list model shared by every graph selector"""
+
+    variable_added = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.known = set()
+        self.model = QtCore.QStringListModel(self)
+
+    def __contains__(self, name):
+        return name in self.known
+
+    def __len__(self):
+        return len(self.known)
+
+    def names(self):
+        return self.model.stringList()
+
+    def register(self, names):
+        """Record names; only variables never seen before touch the model"""
+        known = self.known
+        if known.issuperset(names):
+            return
+        for name in names:
+            if name not in known:
+                known.add(name)
+                row = self.model.rowCount()
+                self.model.insertRows(row, 1)
+                self.model.setData(self.model.index(row), name)
+                self.variable_added.emit(name)
@@ -1,5 +1,4 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
-import json
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -8,21 +7,39 @@ import csv
 import os
 import time
 from datetime import datetime
-from config import MAP_WIDTH, MAP_HEIGHT, ROBOT_DIAMETER, MAX_DATA_POINTS
+import config
+from config import ROBOT_DIAMETER, MAX_DATA_POINTS
 
 # Tạo lớp GraphWidget từ đầu hoặc import từ file riêng
 from graph_widget import GraphWidget
+from render_scheduler import RenderScheduler
+from message_decoder import format_value
+from series_store import SeriesStore
+from table_model import TelemetryTableModel, IncrementalFilterProxy
+from variable_registry import VariableRegistry
 
 class Visualization(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
         
         # Data storage - Phải khởi tạo trước khi setup các component
-        self.data_history = {}
+        self.series_store = SeriesStore(MAX_DATA_POINTS)  # shared by every live graph
         self.max_history = MAX_DATA_POINTS
         self.next_graph_id = 1
         self.graphs = []
         
+        # Every numeric variable seen so far; graph selectors share its list model
+        self.variable_registry = VariableRegistry(self)
+        # variable -> graphs plotting it, kept in sync by the graphs themselves
+        self.subscriptions = {}
+        
+        # Values waiting to be written to the table on the next frame, keyed by (topic, key)
+        self.pending_table = {}
+        self.last_position = None
+        
+        # All repaints go through one frame-rate-driven scheduler
+        self.scheduler = RenderScheduler(self)
+        
         # Main layout
         self.layout = QtWidgets.QVBoxLayout()
         self.layout.setSpacing(2)  # Giảm khoảng cách
@@ -100,6 +117,10 @@ class Visualization(QtWidgets.QWidget):
         
         # Tạo biểu đồ đầu tiên
         self.add_new_graph()
+        
+        self.scheduler.add_target("table", self.render_table)
+        self.scheduler.add_target("map", self.render_map)
+        self.scheduler.start()
 
     def setup_graphs(self):
         # Không cần phương thức này nữa vì đã xử lý trong __init__
@@ -112,6 +133,7 @@ class Visualization(QtWidgets.QWidget):
         
         graph_widget = GraphWidget(self, self.next_graph_id)
         self.graphs.append(graph_widget)
+        self.scheduler.add_target(graph_widget, graph_widget.update_graph)
         self.graphs_layout.addWidget(graph_widget)
         self.next_graph_id += 1
         
@@ -122,14 +144,17 @@ class Visualization(QtWidgets.QWidget):
             self.graphs_layout.addStretch()
     
     def setup_table(self):
-        # Create table widget with fixed height
-        self.table = QtWidgets.QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Topic", "Variable", "Value"])
-        
-        # Adjust column widths
-        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
+        # Create table view over a model holding the latest value per (topic, key)
+        self.table_model = TelemetryTableModel(self)
+        # The view sees the model through a filter proxy keyed on topic and variable
+        self.table_proxy = IncrementalFilterProxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.table_proxy)
+        
+        # Adjust column widths (resized to contents only when rows are added)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Interactive)
+        self.table.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.Interactive)
         self.table.horizontalHeader().setSectionResizeMode(2, QtWidgets.QHeaderView.Stretch)
         
         # Giảm chiều cao mặc định của các hàng để hiển thị nhiều hàng hơn
@@ -146,7 +171,7 @@ class Visualization(QtWidgets.QWidget):
         font.setPointSize(8)
         self.table.setFont(font)
         
-        self.table.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)  # Làm nổi bật các hàng
         
         # Add to layout - đặt bảng ở vị trí đầu tiên trong layout để nó ở trên cùng
@@ -180,23 +205,27 @@ class Visualization(QtWidgets.QWidget):
         self.map_ax.set_xlabel('X Position (m)')
         self.map_ax.set_ylabel('Y Position (m)')
         self.map_ax.grid(True)
-        self.map_ax.set_xlim(0, MAP_WIDTH)
-        self.map_ax.set_ylim(0, MAP_HEIGHT)
         self.map_ax.set_aspect('equal')
         
-        # Initialize robot marker
-        self.robot_marker, = self.map_ax.plot([], [], 'ro', markersize=10)
-        self.trail_line, = self.map_ax.plot([], [], 'r-', alpha=0.5)
+        # Initialize robot marker (animated: drawn by blitting on top of the field layer)
+        self.robot_marker, = self.map_ax.plot([], [], 'ro', markersize=10, animated=True)
+        self.trail_line, = self.map_ax.plot([], [], 'r-', alpha=0.5, animated=True)
         self.trail_data = {'x': [], 'y': []}
         
         # Draw field rectangle
-        field_rect = plt.Rectangle((0, 0), MAP_WIDTH, MAP_HEIGHT, fill=False, color='black')
-        self.map_ax.add_patch(field_rect)
+        self.field_rect = plt.Rectangle((0, 0), 1, 1, fill=False, color='black')
+        self.map_ax.add_patch(self.field_rect)
+        self.map_size = None
+        self.set_field_size(config.MAP_WIDTH, config.MAP_HEIGHT)
         
         # Add robot circle with correct diameter
-        self.robot_circle = plt.Circle((0, 0), ROBOT_DIAMETER/2, fill=True, color='red', alpha=0.3)
+        self.robot_circle = plt.Circle((0, 0), ROBOT_DIAMETER/2, fill=True, color='red', alpha=0.3, animated=True)
         self.map_ax.add_patch(self.robot_circle)
         
+        # Cache the static field layer whenever the map is fully redrawn (first show, resize)
+        self.map_background = None
+        self.map_canvas.mpl_connect('draw_event', self.on_map_draw)
+        
         # Add to layout
         self.map_layout.addWidget(self.map_canvas)
         
@@ -222,193 +251,163 @@ class Visualization(QtWidgets.QWidget):
         
         self.map_layout.addWidget(map_control)
     
-    def update(self, data_str):
-        try:
-            # Try to parse as JSON
-            data = json.loads(data_str)
-            
-            # Update table with new data
-            self.update_table(data)
-            
+    def update(self, record):
+        """Feed one decoded MessageRecord to the table, history, selectors, map and graphs"""
+        # Update table with new data
+        self.update_table(record)
+        
+        numeric = record.numeric
+        if numeric:
             # Update data history
-            self.update_history(data)
+            self.update_history(numeric, record.timestamp)
             
-            # Update variable selectors for all graphs
-            self.update_variable_selectors(data)
+            # Register variables seen for the first time
+            self.variable_registry.register(numeric)
             
             # Update position map if data contains x/y coordinates
-            self.update_position(data)
+            self.update_position(numeric)
             
             # Update all active graphs with new data
-            self.update_graphs(data)
-            
-        except json.JSONDecodeError:
-            # If not JSON, try to handle as simple values
-            print(f"Received non-JSON data: {data_str}")
-            
-            # Try to handle as floating point number
-            try:
-                value = float(data_str)
-                # Create a simple data dict with the value
-                data = {"value": value}
-                
-                # Update with this simple data
-                self.update_table(data)
-                self.update_history(data)
-                self.update_variable_selectors(data)
-                self.update_graphs(data)
-                
-            except ValueError:
-                # Not a number either, use as string
-                data = {"message": data_str}
-                self.update_table(data)
+            receive_time = record.receive_time if record.device_time is not None else None
+            self.update_graphs(numeric, record.timestamp, receive_time)
     
-    def update_table(self, data):
-        if isinstance(data, dict):
-            # Find existing rows and update or add new
-            for key, value in data.items():
-                found = False
-                for row in range(self.table.rowCount()):
-                    if self.table.item(row, 1) and self.table.item(row, 1).text() == key:
-                        # Update existing row
-                        self.table.item(row, 2).setText(str(value))
-                        found = True
-                        break
-                
-                if not found:
-                    # Add new row
-                    rowPosition = self.table.rowCount()
-                    self.table.insertRow(rowPosition)
-                    topic_item = QtWidgets.QTableWidgetItem("current")
-                    key_item = QtWidgets.QTableWidgetItem(key)
-                    value_item = QtWidgets.QTableWidgetItem(str(value))
-                    self.table.setItem(rowPosition, 0, topic_item)
-                    self.table.setItem(rowPosition, 1, key_item)
-                    self.table.setItem(rowPosition, 2, value_item)
+    def update_table(self, record):
+        """Queue table values; only the latest value per (topic, key) is written on the next frame"""
+        topic = record.topic
+        pending = self.pending_table
+        for key, value in record.numeric.items():
+            pending[(topic, key)] = value
+        for key, value in record.text.items():
+            pending[(topic, key)] = value
+        self.scheduler.mark_dirty("table")
     
-    def update_history(self, data):
-        if isinstance(data, dict):
-            for key, value in data.items():
-                try:
-                    # Try to convert to float for graphing
-                    value = float(value)
-                    
-                    if key not in self.data_history:
-                        self.data_history[key] = []
-                    
-                    self.data_history[key].append(value)
-                    
-                    # Limit history size
-                    if len(self.data_history[key]) > self.max_history:
-                        self.data_history[key].pop(0)
-                        
-                except (ValueError, TypeError):
-                    # Skip non-numeric values
-                    pass
+    def render_table(self):
+        """Publish the pending values to the table model as one batch"""
+        if not self.pending_table:
+            return
+        data = self.pending_table
+        self.pending_table = {}
+        
+        first_row, end_row = self.table_model.apply_updates(data)
+        if end_row > first_row:
+            # New rows were matched against the filter by the proxy on insertion
+            self.table.resizeColumnToContents(0)
+            self.table.resizeColumnToContents(1)
     
-    def update_variable_selectors(self, data):
-        if isinstance(data, dict):
-            numeric_variables = []
-            for key, value in data.items():
-                try:
-                    # Only add if value is numeric
-                    float(value)
-                    numeric_variables.append(key)
-                except (ValueError, TypeError):
-                    pass
-            
-            # Update selectors in all graph widgets
-            for graph in self.graphs:
-                graph.update_variable_selector(numeric_variables)
+    def update_history(self, numeric, timestamp):
+        # Ring buffers drop the oldest samples once MAX_DATA_POINTS is reached
+        self.series_store.append_many(numeric, timestamp)
+    
+    def update_graphs(self, numeric, timestamp=None, receive_time=None):
+        """Send each sample, with its sample and receive times, only to the graphs that plot it"""
+        subscriptions = self.subscriptions
+        if not subscriptions:
+            return
+        for key, value in numeric.items():
+            graphs = subscriptions.get(key)
+            if graphs:
+                for graph in graphs:
+                    graph.update_data(key, value, timestamp, receive_time)
+    
+    def subscribe(self, graph, variable):
+        graphs = self.subscriptions.setdefault(variable, [])
+        if graph not in graphs:
+            graphs.append(graph)
+    
+    def unsubscribe(self, graph, variable):
+        graphs = self.subscriptions.get(variable)
+        if graphs and graph in graphs:
+            graphs.remove(graph)
+            if not graphs:
+                del self.subscriptions[variable]
     
-    def update_graphs(self, data):
-        """Update all graphs with new data"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                try:
-                    # Only process numeric values
-                    float_value = float(value)
-                    # Update all graph widgets
-                    for graph in self.graphs:
-                        graph.update_data(key, float_value)
-                except (ValueError, TypeError):
-                    # Skip non-numeric values
-                    pass
+    def unsubscribe_all(self, graph):
+        for variable in list(self.subscriptions):
+            self.unsubscribe(graph, variable)
     
-    def update_position(self, data):
-        # Check if we have position data
-        has_update = False
-        
-        if 'x' in data and 'y' in data:
-            try:
-                x = float(data['x'])
-                y = float(data['y'])
-                has_update = True
-            except (ValueError, TypeError):
-                pass
+    def update_position(self, numeric):
+        # Check if we have position data (values are already floats)
+        if 'x' in numeric and 'y' in numeric:
+            x, y = numeric['x'], numeric['y']
         
         # Alternative key names
-        elif 'position_x' in data and 'position_y' in data:
-            try:
-                x = float(data['position_x'])
-                y = float(data['position_y'])
-                has_update = True
-            except (ValueError, TypeError):
-                pass
-        
-        elif 'encoder_x' in data and 'encoder_y' in data:
-            try:
-                x = float(data['encoder_x'])
-                y = float(data['encoder_y'])
-                has_update = True
-            except (ValueError, TypeError):
-                pass
-                
-        # Update the position if we have data
-        if has_update:
-            # Update position label
-            self.position_label.setText(f"Position: ({x:.2f}, {y:.2f})")
-            
-            # Update robot marker
-            self.robot_marker.set_data([x], [y])
-            
-            # Update robot circle position
-            self.robot_circle.center = (x, y)
+        elif 'position_x' in numeric and 'position_y' in numeric:
+            x, y = numeric['position_x'], numeric['position_y']
+        
+        elif 'encoder_x' in numeric and 'encoder_y' in numeric:
+            x, y = numeric['encoder_x'], numeric['encoder_y']
+        
+        else:
+            return
+        
+        self.last_position = (x, y)
+        
+        # Update robot marker
+        self.robot_marker.set_data([x], [y])
+        
+        # Update robot circle position
+        self.robot_circle.center = (x, y)
+        
+        # Update trail
+        if self.trail_checkbox.isChecked():
+            self.trail_data['x'].append(x)
+            self.trail_data['y'].append(y)
             
-            # Update trail
-            if self.trail_checkbox.isChecked():
-                self.trail_data['x'].append(x)
-                self.trail_data['y'].append(y)
-                
-                # Limit trail length
-                if len(self.trail_data['x']) > self.max_history:
-                    self.trail_data['x'].pop(0)
-                    self.trail_data['y'].pop(0)
-                
-                self.trail_line.set_data(self.trail_data['x'], self.trail_data['y'])
+            # Limit trail length
+            if len(self.trail_data['x']) > self.max_history:
+                self.trail_data['x'].pop(0)
+                self.trail_data['y'].pop(0)
             
-            # Redraw map
+            self.trail_line.set_data(self.trail_data['x'], self.trail_data['y'])
+        
+        # Redraw map on the next frame
+        self.scheduler.mark_dirty("map")
+    
+    def set_field_size(self, width, height):
+        """Resize the field layer; the cached background is rebuilt on the next frame"""
+        self.map_size = (width, height)
+        self.field_rect.set_width(width)
+        self.field_rect.set_height(height)
+        self.map_ax.set_xlim(0, width)
+        self.map_ax.set_ylim(0, height)
+        self.map_background = None
+    
+    def render_map(self):
+        """Repaint the robot and trail over the cached field background"""
+        if self.last_position is not None:
+            x, y = self.last_position
+            self.position_label.setText(f"Position: ({x:.2f}, {y:.2f})")
+        
+        # Field dimensions changed in config: rebuild the static layer
+        if self.map_size != (config.MAP_WIDTH, config.MAP_HEIGHT):
+            self.set_field_size(config.MAP_WIDTH, config.MAP_HEIGHT)
+        
+        if self.map_background is None:
             self.map_canvas.draw()
+            return
+        
+        self.map_canvas.restore_region(self.map_background)
+        self.draw_map_artists()
+        self.map_canvas.blit(self.map_ax.bbox)
+    
+    def draw_map_artists(self):
+        self.map_ax.draw_artist(self.trail_line)
+        self.map_ax.draw_artist(self.robot_circle)
+        self.map_ax.draw_artist(self.robot_marker)
+    
+    def on_map_draw(self, event):
+        """Cache the field layer after a full redraw and paint the robot on top"""
+        self.map_background = self.map_canvas.copy_from_bbox(self.map_ax.bbox)
+        self.draw_map_artists()
     
     def filter_table(self):
-        filter_text = self.filter_input.text().lower()
-        
-        for row in range(self.table.rowCount()):
-            hide_row = True
-            
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                if item and filter_text in item.text().lower():
-                    hide_row = False
-                    break
-            
-            self.table.setRowHidden(row, hide_row)
+        self.table_proxy.set_query(self.filter_input.text())
     
     def clear_trail(self):
         self.trail_data = {'x': [], 'y': []}
         self.trail_line.set_data([], [])
-        self.map_canvas.draw()
+        self.scheduler.mark_dirty("map")
     
     def update_trail_visibility(self):
         self.trail_line.set_visible(self.trail_checkbox.isChecked())
-        self.map_canvas.draw()
\ No newline at end of file
+        self.scheduler.mark_dirty("map")
\ No newline at end of file